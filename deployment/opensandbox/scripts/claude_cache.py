@@ -0,0 +1,77 @@
+"""
+NVDA Vision - Claude响应缓存
+
+以prompt和调用上下文（模型、Base URL、镜像、上传文件摘要）的SHA-256为键，
+把Claude CLI的响应缓存到本地磁盘。仅在集成测试显式传入 --cache 时启用，
+任一上下文变化都不会命中旧响应。
+
+缓存位置: ~/.cache/nvda-vision-claude/{hash}.json
+有效期: CLAUDE_CACHE_TTL_DAYS 环境变量（默认7天）
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Mapping, Optional
+
+CACHE_DIR = Path.home() / ".cache" / "nvda-vision-claude"
+
+
+def _cache_path(prompt: str, context: Mapping[str, str]) -> Path:
+    """根据prompt和调用上下文计算缓存文件路径"""
+    key = json.dumps(
+        {"prompt": prompt, "context": dict(context)},
+        sort_keys=True, ensure_ascii=False
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _ttl_seconds() -> float:
+    """缓存有效期（秒）"""
+    return float(os.getenv("CLAUDE_CACHE_TTL_DAYS", "7")) * 24 * 3600
+
+
+def get(prompt: str, context: Mapping[str, str]) -> Optional[str]:
+    """
+    读取缓存的响应
+
+    Args:
+        prompt: 发送给Claude的prompt
+        context: 影响响应的其他输入（模型、Base URL、上传文件摘要等）
+
+    Returns:
+        缓存的响应文本，未命中或已过期时返回None
+    """
+    try:
+        entry = json.loads(_cache_path(prompt, context).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created_at", 0) > _ttl_seconds():
+        return None
+
+    return entry.get("response")
+
+
+def set(prompt: str, response: str, context: Mapping[str, str]):
+    """
+    写入响应缓存
+
+    Args:
+        prompt: 发送给Claude的prompt
+        response: Claude的响应文本
+        context: 影响响应的其他输入，与get()传入的一致
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "prompt": prompt,
+        "context": dict(context),
+        "response": response,
+        "created_at": time.time(),
+    }
+    _cache_path(prompt, context).write_text(
+        json.dumps(entry, ensure_ascii=False), encoding="utf-8"
+    )
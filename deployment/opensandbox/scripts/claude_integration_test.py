@@ -6,15 +6,63 @@ NVDA Vision - OpenSandbox + Claude Code 集成测试
 """
 
 import asyncio
+import contextvars
+import functools
+import hashlib
+import io
 import os
 import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 from opensandbox import Sandbox
 from opensandbox.config import ConnectionConfig
 
+import claude_cache
+
+
+# 限制并发创建沙箱的数量，避免压垮Docker守护进程；只覆盖冷启动阶段
+_SANDBOX_SEM = asyncio.Semaphore(int(os.getenv("SANDBOX_MAX_PARALLEL", "2")))
+
+# 测试函数返回此值表示跳过（不计入通过或失败）
+SKIPPED = "skipped"
+
+# 是否使用Claude响应缓存（--cache 开启）；默认关闭，集成测试应真正调用Claude
+_use_claude_cache = False
+
+# 并发运行的测试各自缓冲输出，gather结束后按顺序统一打印，避免日志交错
+_test_output: contextvars.ContextVar[Optional[io.StringIO]] = contextvars.ContextVar(
+    "_test_output", default=None
+)
+
+
+class _TaskLocalStdout(io.TextIOBase):
+    """按当前任务的上下文把写入路由到各自的缓冲区"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = _test_output.get()
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+async def run_buffered(test_coro):
+    """在独立缓冲区中运行测试，返回 (结果, 输出)"""
+    buffer = io.StringIO()
+    _test_output.set(buffer)
+    try:
+        result = await test_coro
+    except Exception as e:
+        result = e
+    return result, buffer.getvalue()
+
 
 def load_env_file(env_path: str = ".env"):
     """加载.env文件"""
@@ -24,22 +72,19 @@ def load_env_file(env_path: str = ".env"):
         return
 
     print(f"📝 加载环境变量从: {env_file.absolute()}")
-    with open(env_file, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                os.environ[key.strip()] = value.strip()
+    lines = (line.strip() for line in env_file.read_text("utf-8").splitlines())
+    pairs = (
+        line.split("=", 1) for line in lines
+        if line and not line.startswith("#") and "=" in line
+    )
+    os.environ.update({key.strip(): value.strip() for key, value in pairs})
 
 
 def check_required_env():
     """检查必需的环境变量"""
     required = ["ANTHROPIC_AUTH_TOKEN"]
-    missing = []
-
-    for var in required:
-        if not os.getenv(var):
-            missing.append(var)
+    envs = os.environ
+    missing = [var for var in required if not envs.get(var)]
 
     if missing:
         print(f"\n❌ 缺少必需的环境变量: {', '.join(missing)}")
@@ -50,98 +95,180 @@ def check_required_env():
 
 
 async def print_execution_logs(execution):
-    """打印命令执行日志"""
-    if execution.logs.stdout:
-        for msg in execution.logs.stdout:
-            print(f"[stdout] {msg.text}")
-
-    if execution.logs.stderr:
-        for msg in execution.logs.stderr:
-            print(f"[stderr] {msg.text}")
+    """打印命令执行日志（拼接后一次写出）"""
+    parts = [f"[stdout] {msg.text}\n" for msg in execution.logs.stdout or ()]
+    parts.extend(f"[stderr] {msg.text}\n" for msg in execution.logs.stderr or ())
 
     if execution.error:
-        print(f"[error] {execution.error.name}: {execution.error.value}")
-
+        parts.append(f"[error] {execution.error.name}: {execution.error.value}\n")
+
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+
+def _files_digest(paths: Sequence[Path]) -> str:
+    """上传文件内容的SHA-256摘要（文件变化后缓存失效）"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+async def run_claude_cached(
+    sandbox,
+    prompt: str,
+    env: "_Env",
+    uploaded: Sequence[Path] = ()
+) -> bool:
+    """
+    运行 claude "<prompt>"，启用缓存且上下文一致时直接输出缓存的响应
+
+    Args:
+        sandbox: 沙箱实例
+        prompt: 发送给Claude的prompt
+        env: 环境变量快照（模型、Base URL、镜像参与缓存键）
+        uploaded: 本次测试上传到沙箱的本地文件
+    """
+    context = {
+        "model": env.claude_model,
+        "base_url": env.claude_base_url or "",
+        "image": env.image,
+        "uploads": _files_digest(uploaded),
+    }
 
-async def test_basic_claude_integration():
-    """测试1：基本Claude CLI集成"""
-    print("\n" + "=" * 70)
-    print("🧪 测试1: 基本Claude CLI集成")
-    print("=" * 70)
+    if _use_claude_cache:
+        cached = claude_cache.get(prompt, context)
+        if cached is not None:
+            print("[cache] 命中Claude响应缓存")
+            for line in cached.splitlines():
+                print(f"[stdout] {line}")
+            return True
+
+    execution = await sandbox.commands.run(f'claude "{prompt}"')
+    await print_execution_logs(execution)
+
+    if execution.exit_code != 0:
+        return False
+
+    if _use_claude_cache:
+        claude_cache.set(
+            prompt, "\n".join(msg.text for msg in execution.logs.stdout), context
+        )
+    return True
+
+
+@dataclass(frozen=True)
+class _Env:
+    """加载.env后解析出的环境变量快照，测试函数共用"""
+
+    domain: str
+    api_key: Optional[str]
+    claude_token: Optional[str]
+    claude_base_url: Optional[str]
+    claude_model: str
+    image: str
+
+    @classmethod
+    def from_environ(cls) -> "_Env":
+        """从当前进程环境变量创建快照"""
+        envs = os.environ
+        return cls(
+            domain=envs.get("SANDBOX_DOMAIN", "localhost:8080"),
+            api_key=envs.get("SANDBOX_API_KEY"),
+            claude_token=envs.get("ANTHROPIC_AUTH_TOKEN"),
+            claude_base_url=envs.get("ANTHROPIC_BASE_URL"),
+            claude_model=envs.get("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929"),
+            image=envs.get("SANDBOX_IMAGE", "opensandbox/code-interpreter:latest"),
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_config(env: _Env, timeout_s: int) -> ConnectionConfig:
+    """OpenSandbox连接配置（同一次运行中只构建一次）"""
+    return ConnectionConfig(
+        domain=env.domain,
+        api_key=env.api_key,
+        request_timeout=timedelta(seconds=timeout_s),
+    )
 
-    # 加载配置
-    domain = os.getenv("SANDBOX_DOMAIN", "localhost:8080")
-    api_key = os.getenv("SANDBOX_API_KEY")
-    claude_token = os.getenv("ANTHROPIC_AUTH_TOKEN")
-    claude_base_url = os.getenv("ANTHROPIC_BASE_URL")
-    claude_model = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
-    image = os.getenv("SANDBOX_IMAGE", "opensandbox/code-interpreter:latest")
 
-    print(f"\n📋 配置:")
-    print(f"  OpenSandbox: {domain}")
-    print(f"  Docker镜像: {image}")
-    print(f"  Claude模型: {claude_model}")
-    print(f"  Auth Token: {claude_token[:20]}..." if claude_token else "  Auth Token: 未设置")
-
-    # 配置连接
-    config = ConnectionConfig(
-        domain=domain,
-        api_key=api_key,
-        request_timeout=timedelta(seconds=120),
-    )
+@functools.lru_cache(maxsize=1)
+def _get_env(env: _Env) -> tuple:
+    """
+    沙箱环境变量（三个测试所需变量的并集）
 
-    # 环境变量
-    env = {
-        "ANTHROPIC_AUTH_TOKEN": claude_token,
-        "ANTHROPIC_BASE_URL": claude_base_url,
-        "ANTHROPIC_MODEL": claude_model,
+    返回可哈希的 (key, value) 元组，调用处用 dict() 转换。
+    Claude CLI默认给系统提示加 cache_control 启用prompt缓存，
+    这里刻意不传入 DISABLE_PROMPT_CACHING，三个测试共享同一份缓存前缀。
+    """
+    sandbox_env = {
+        "ANTHROPIC_AUTH_TOKEN": env.claude_token,
+        "ANTHROPIC_BASE_URL": env.claude_base_url,
+        "ANTHROPIC_MODEL": env.claude_model,
         "IS_SANDBOX": "1",
+        "PYTHONUNBUFFERED": "1",
     }
-    env = {k: v for k, v in env.items() if v is not None}
+    return tuple((k, v) for k, v in sandbox_env.items() if v is not None)
+
+
+@asynccontextmanager
+async def shared_sandbox(env: _Env):
+    """创建三个测试共用的沙箱，只付一次容器启动和Claude CLI安装的开销"""
+    print(f"\n📋 配置:")
+    print(f"  OpenSandbox: {env.domain}")
+    print(f"  Docker镜像: {env.image}")
+    print(f"  Claude模型: {env.claude_model}")
+    print(f"  Auth Token: {env.claude_token[:20]}..." if env.claude_token else "  Auth Token: 未设置")
 
     # 创建沙箱
     print("\n🚀 创建沙箱...")
-    sandbox = await Sandbox.create(
-        image,
-        connection_config=config,
-        env=env,
-    )
+    async with _SANDBOX_SEM:
+        sandbox = await Sandbox.create(
+            env.image,
+            connection_config=_get_config(env, 180),
+            env=dict(_get_env(env)),
+        )
 
     try:
         async with sandbox:
-            # 安装Claude CLI
-            print("\n📦 安装 @anthropic-ai/claude-code ...")
-            install_exec = await sandbox.commands.run(
-                "npm i -g @anthropic-ai/claude-code@latest"
-            )
-            await print_execution_logs(install_exec)
-
-            if install_exec.exit_code != 0:
-                print("❌ Claude CLI安装失败")
-                return False
-
-            print("\n✅ Claude CLI安装成功")
-
-            # 测试Claude响应
-            print("\n🤖 测试Claude响应...")
-            run_exec = await sandbox.commands.run(
-                'claude "计算 1+1=? 并简短回答"'
-            )
-            await print_execution_logs(run_exec)
-
-            if run_exec.exit_code == 0:
-                print("\n✅ Claude响应成功！")
-                return True
-            else:
-                print("\n❌ Claude响应失败")
-                return False
+            # 安装Claude CLI（镜像已预装时跳过）
+            if os.getenv("SKIP_CLAUDE_INSTALL") != "1":
+                print("\n📦 安装 @anthropic-ai/claude-code ...")
+                install_exec = await sandbox.commands.run(
+                    "npm i -g @anthropic-ai/claude-code@latest"
+                )
+                await print_execution_logs(install_exec)
+
+                if install_exec.exit_code != 0:
+                    raise RuntimeError("Claude CLI安装失败")
+
+                print("\n✅ Claude CLI安装成功")
+
+            yield sandbox
 
     finally:
         await sandbox.kill()
         print("\n🧹 沙箱已清理")
 
 
-async def test_code_analysis():
+async def test_basic_claude_integration(sandbox, env: _Env):
+    """测试1：基本Claude CLI集成"""
+    print("\n" + "=" * 70)
+    print("🧪 测试1: 基本Claude CLI集成")
+    print("=" * 70)
+
+    # 测试Claude响应
+    print("\n🤖 测试Claude响应...")
+    if await run_claude_cached(sandbox, "计算 1+1=? 并简短回答", env):
+        print("\n✅ Claude响应成功！")
+        return True
+    else:
+        print("\n❌ Claude响应失败")
+        return False
+
+
+async def test_code_analysis(sandbox, env: _Env):
     """测试2：使用Claude分析NVDA Vision代码"""
     print("\n" + "=" * 70)
     print("🧪 测试2: 代码分析功能")
@@ -152,151 +279,121 @@ async def test_code_analysis():
     if not test_file.exists():
         print(f"\n⚠️ 测试文件不存在: {test_file}")
         print("跳过此测试")
-        return True
-
-    domain = os.getenv("SANDBOX_DOMAIN", "localhost:8080")
-    config = ConnectionConfig(
-        domain=domain,
-        request_timeout=timedelta(seconds=180),
+        return SKIPPED
+
+    # 上传代码文件（以二进制文件对象流式上传，不经过 str/bytes 转换）
+    print(f"\n📤 上传 {test_file} 到沙箱...")
+    with open(test_file, "rb") as f:
+        await sandbox.files.write_files([{
+            "path": "/tmp/config.py",
+            "content": f
+        }])
+    print("✅ 文件上传成功")
+
+    # Claude分析代码
+    print("\n🤖 让Claude分析代码...")
+    print("\n" + "-" * 70)
+    success = await run_claude_cached(
+        sandbox,
+        "请简要分析 /tmp/config.py 这个配置管理文件，"
+        "评价其设计是否合理。限制在3-5行回答。",
+        env,
+        uploaded=[test_file],
     )
+    print("-" * 70)
 
-    env = {
-        "ANTHROPIC_AUTH_TOKEN": os.getenv("ANTHROPIC_AUTH_TOKEN"),
-        "ANTHROPIC_MODEL": os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929"),
-    }
+    if success:
+        print("\n✅ 代码分析成功！")
+        return True
+    else:
+        print("\n❌ 代码分析失败")
+        return False
 
-    sandbox = await Sandbox.create(
-        os.getenv("SANDBOX_IMAGE", "opensandbox/code-interpreter:latest"),
-        connection_config=config,
-        env=env,
-    )
 
+async def has_nvda_vision_image() -> bool:
+    """检查本地是否已构建nvda-vision Docker镜像（不阻塞事件循环）"""
     try:
-        async with sandbox:
-            # 安装Claude CLI
-            print("\n📦 安装Claude CLI...")
-            await sandbox.commands.run("npm i -g @anthropic-ai/claude-code@latest")
-
-            # 上传代码文件
-            print(f"\n📤 上传 {test_file} 到沙箱...")
-            with open(test_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            await sandbox.files.write_files([{
-                "path": "/tmp/config.py",
-                "content": content.encode("utf-8")
-            }])
-            print("✅ 文件上传成功")
-
-            # Claude分析代码
-            print("\n🤖 让Claude分析代码...")
-            analysis = await sandbox.commands.run(
-                'claude "请简要分析 /tmp/config.py 这个配置管理文件，'
-                '评价其设计是否合理。限制在3-5行回答。"'
-            )
-
-            print("\n" + "-" * 70)
-            await print_execution_logs(analysis)
-            print("-" * 70)
-
-            if analysis.exit_code == 0:
-                print("\n✅ 代码分析成功！")
-                return True
-            else:
-                print("\n❌ 代码分析失败")
-                return False
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "images", "nvda-vision", "--format", "{{.Repository}}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        return False
 
-    finally:
-        await sandbox.kill()
+    out, _ = await proc.communicate()
+    return b"nvda-vision" in out
 
 
-async def test_nvda_vision_container():
+async def test_nvda_vision_container(sandbox, env: _Env, has_image: bool):
     """测试3：在NVDA Vision专用容器中使用Claude"""
     print("\n" + "=" * 70)
     print("🧪 测试3: NVDA Vision容器集成")
     print("=" * 70)
 
-    # 检查镜像是否存在
-    import subprocess
-    result = subprocess.run(
-        ["docker", "images", "nvda-vision", "--format", "{{.Repository}}"],
-        capture_output=True,
-        text=True
-    )
-
-    if "nvda-vision" not in result.stdout:
+    if not has_image:
         print("\n⚠️ nvda-vision Docker镜像不存在")
         print("请先构建镜像:")
         print('  docker build -t nvda-vision:latest -f deployment/opensandbox/Dockerfile .')
         print("\n跳过此测试")
-        return True
-
-    domain = os.getenv("SANDBOX_DOMAIN", "localhost:8080")
-    config = ConnectionConfig(
-        domain=domain,
-        request_timeout=timedelta(seconds=180),
+        return SKIPPED
+
+    # 按能力而非镜像名判断：共享沙箱里要有 /app（NVDA Vision代码）；
+    # 同时检查Claude CLI并预热 /app 目录缓存
+    print("\n📦 检查NVDA Vision环境和Claude CLI...")
+    app_dir, version = await asyncio.gather(
+        sandbox.commands.run("test -d /app && ls -R /app > /dev/null"),
+        sandbox.commands.run("claude --version"),
     )
 
-    env = {
-        "ANTHROPIC_AUTH_TOKEN": os.getenv("ANTHROPIC_AUTH_TOKEN"),
-        "ANTHROPIC_MODEL": os.getenv("ANTHROPIC_MODEL"),
-        "PYTHONUNBUFFERED": "1",
-    }
+    if app_dir.exit_code != 0:
+        print(f"\n⚠️ 当前沙箱镜像 {env.image} 中没有 /app 目录")
+        print("请在 .env 中设置: SANDBOX_IMAGE=nvda-vision:latest")
+        print("\n跳过此测试")
+        return SKIPPED
 
-    # 使用NVDA Vision镜像
-    print("\n🚀 使用NVDA Vision镜像创建沙箱...")
-    sandbox = await Sandbox.create(
-        "nvda-vision:latest",
-        connection_config=config,
-        env=env,
+    if version.exit_code != 0:
+        print("❌ 镜像中未找到Node.js/Claude CLI，镜像可能已过期，请重新构建:")
+        print('  docker build -t nvda-vision:latest -f deployment/opensandbox/Dockerfile .')
+        return False
+
+    # 测试Claude与NVDA Vision环境交互
+    print("\n🤖 测试Claude在NVDA Vision环境中...")
+    print("\n" + "-" * 70)
+    success = await run_claude_cached(
+        sandbox,
+        "检查 /app 目录结构，列出主要的Python源文件。"
+        "限制在5行内回答。",
+        env,
     )
+    print("-" * 70)
 
-    try:
-        async with sandbox:
-            # 先安装Node.js和npm（如果镜像中没有）
-            print("\n📦 检查并安装Node.js...")
-            node_check = await sandbox.commands.run("which node || echo 'not_found'")
-
-            if "not_found" in str(node_check.logs.stdout):
-                print("   安装Node.js...")
-                await sandbox.commands.run(
-                    "apt-get update && apt-get install -y nodejs npm"
-                )
-
-            # 安装Claude CLI
-            print("\n📦 安装Claude CLI...")
-            install = await sandbox.commands.run(
-                "npm i -g @anthropic-ai/claude-code@latest"
-            )
-
-            if install.exit_code != 0:
-                print("❌ Claude CLI安装失败")
-                return False
-
-            # 测试Claude与NVDA Vision环境交互
-            print("\n🤖 测试Claude在NVDA Vision环境中...")
-            test_cmd = await sandbox.commands.run(
-                'claude "检查 /app 目录结构，列出主要的Python源文件。'
-                '限制在5行内回答。"'
-            )
-
-            print("\n" + "-" * 70)
-            await print_execution_logs(test_cmd)
-            print("-" * 70)
-
-            if test_cmd.exit_code == 0:
-                print("\n✅ NVDA Vision容器测试成功！")
-                return True
-            else:
-                print("\n❌ NVDA Vision容器测试失败")
-                return False
-
-    finally:
-        await sandbox.kill()
+    if success:
+        print("\n✅ NVDA Vision容器测试成功！")
+        return True
+    else:
+        print("\n❌ NVDA Vision容器测试失败")
+        return False
 
 
 async def main():
     """主测试函数"""
+    import argparse
+
+    global _use_claude_cache
+
+    parser = argparse.ArgumentParser(
+        description="OpenSandbox + Claude Code 集成测试"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="复用本地缓存的Claude响应（仅用于调试脚本本身，不验证真实调用）"
+    )
+
+    args = parser.parse_args()
+    _use_claude_cache = args.cache
+
     print("\n" + "=" * 70)
     print("  NVDA Vision - OpenSandbox + Claude Code 集成测试")
     print("=" * 70)
@@ -316,23 +413,30 @@ async def main():
 
     # 检查必需环境变量
     check_required_env()
-
-    # 运行测试
+    env = _Env.from_environ()
+
+    # 检查镜像是否存在（只检查一次）
+    has_image = await has_nvda_vision_image()
+
+    # 运行测试（三个测试共用一个沙箱，互不依赖，并发执行）
+    tests = [
+        ("基本Claude CLI集成", test_basic_claude_integration),
+        ("代码分析功能", test_code_analysis),
+        ("NVDA Vision容器集成", functools.partial(
+            test_nvda_vision_container, has_image=has_image
+        )),
+    ]
     results = []
 
     try:
-        # 测试1：基本集成
-        result1 = await test_basic_claude_integration()
-        results.append(("基本Claude CLI集成", result1))
-
-        # 测试2：代码分析
-        result2 = await test_code_analysis()
-        results.append(("代码分析功能", result2))
-
-        # 测试3：NVDA Vision容器
-        result3 = await test_nvda_vision_container()
-        results.append(("NVDA Vision容器集成", result3))
-
+        async with shared_sandbox(env) as sandbox:
+            sys.stdout = _TaskLocalStdout(sys.stdout)
+            try:
+                outcomes = await asyncio.gather(
+                    *(run_buffered(test(sandbox, env)) for _, test in tests)
+                )
+            finally:
+                sys.stdout = sys.stdout._stream
     except KeyboardInterrupt:
         print("\n\n⚠️ 测试被用户中断")
         sys.exit(130)
@@ -342,6 +446,15 @@ async def main():
         traceback.print_exc()
         sys.exit(1)
 
+    for (test_name, _), (result, output) in zip(tests, outcomes):
+        sys.stdout.write(output)
+        if isinstance(result, Exception):
+            print(f"\n❌ {test_name} 过程中发生错误: {result}")
+            import traceback
+            traceback.print_exception(result)
+            result = False
+        results.append((test_name, result))
+
     # 输出总结
     print("\n" + "=" * 70)
     print("📊 测试总结")
@@ -349,14 +462,22 @@ async def main():
 
     all_passed = True
     for test_name, passed in results:
-        status = "✅ 通过" if passed else "❌ 失败"
-        print(f"  {status}  {test_name}")
-        if not passed:
+        if passed is SKIPPED:
+            status = "⏭️ 跳过"
+        elif passed:
+            status = "✅ 通过"
+        else:
+            status = "❌ 失败"
             all_passed = False
+        print(f"  {status}  {test_name}")
 
     print("=" * 70)
 
-    if all_passed:
+    skipped = sum(1 for _, passed in results if passed is SKIPPED)
+    if all_passed and skipped:
+        print(f"\n✅ 无失败，但有{skipped}项测试被跳过\n")
+        sys.exit(0)
+    elif all_passed:
         print("\n🎉 所有测试通过！OpenSandbox + Claude Code 集成成功！\n")
         sys.exit(0)
     else:
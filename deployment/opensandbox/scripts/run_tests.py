@@ -5,12 +5,26 @@ NVDA Vision - OpenSandbox 测试运行器
 """
 
 from opensandbox import Sandbox
+from opensandbox.models.execd import ExecutionHandlers, RunCommandOpts
+from collections import deque
 from datetime import timedelta
 import asyncio
+import shlex
 import sys
 from pathlib import Path
 from typing import Optional
-import json
+
+# orjson解析大体积coverage.json快3-5倍，未安装时回退到标准库
+try:
+    import orjson as json
+except ImportError:
+    import json
+
+# 结果字典中只保留输出的最后N行，完整输出已实时打印
+OUTPUT_TAIL_LINES = 200
+
+# 关闭沙箱最多等待的秒数，超时后由服务端超时回收
+CLOSE_TIMEOUT_S = 30.0
 
 
 class TestRunner:
@@ -20,15 +34,23 @@ class TestRunner:
         self,
         image: str = "nvda-vision:latest",
         timeout_minutes: int = 10,
-        verbose: bool = True
+        verbose: bool = True,
+        backend: str = "docker"
     ):
         self.image = image
         self.timeout = timedelta(minutes=timeout_minutes)
         self.verbose = verbose
+        self.backend = backend
         self.sandbox: Optional[Sandbox] = None
+        # sandlock后端：本地轻量沙箱，直接在当前项目目录运行pytest
+        self.container = None
+        self.workdir = "/app" if backend == "docker" else "."
 
     async def setup_sandbox(self) -> Sandbox:
         """创建并配置沙箱"""
+        if self.backend == "sandlock":
+            return self._setup_sandlock()
+
         if self.verbose:
             print(f"🚀 创建沙箱容器: {self.image}")
 
@@ -49,11 +71,81 @@ class TestRunner:
 
         return self.sandbox
 
+    def _setup_sandlock(self):
+        """创建sandlock轻量沙箱（无需Docker镜像，启动开销为毫秒级）"""
+        try:
+            from sandlock import Resources, SandlockContainer
+        except ImportError:
+            raise RuntimeError("sandlock后端需要先安装: pip install sandlock")
+
+        if self.verbose:
+            print("🚀 创建sandlock沙箱")
+
+        self.container = SandlockContainer(
+            image=None,
+            resources=Resources(memory=1024)
+        )
+
+        if self.verbose:
+            print("✅ 沙箱创建成功")
+
+        return self.container
+
+    def _emit(self, text: str, stream, tail: deque):
+        """实时输出一段命令输出，并记录到尾部缓冲"""
+        if self.verbose:
+            stream.write(text)
+            stream.flush()
+        tail.extend(text.splitlines())
+
+    async def _exec(self, argv: list):
+        """
+        在当前后端的工作目录中直接执行命令（不经过shell），输出实时打印
+
+        Returns:
+            (退出码, stdout最后N行, stderr最后N行)
+        """
+        stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+
+        if self.container is not None:
+            exit_code, output = await asyncio.to_thread(
+                self.container.exec_run, argv
+            )
+            self._emit(
+                output.decode("utf-8", errors="replace"), sys.stdout, stdout_tail
+            )
+            return exit_code, "\n".join(stdout_tail), ""
+
+        async def on_stdout(msg):
+            self._emit(msg.text, sys.stdout, stdout_tail)
+
+        async def on_stderr(msg):
+            self._emit(msg.text, sys.stderr, stderr_tail)
+
+        execution = await self.sandbox.commands.run(
+            argv,
+            opts=RunCommandOpts(working_directory=self.workdir),
+            handlers=ExecutionHandlers(on_stdout=on_stdout, on_stderr=on_stderr)
+        )
+        return (
+            execution.exit_code,
+            "\n".join(stdout_tail),
+            "\n".join(stderr_tail)
+        )
+
+    async def _read_file(self, path: str) -> bytes:
+        """读取沙箱中的文件（sandlock后端直接读取本地文件）"""
+        if self.container is not None:
+            return await asyncio.to_thread(Path(path).read_bytes)
+        return await self.sandbox.files.read(path)
+
     async def run_tests(
         self,
         test_path: str = "tests/",
         markers: Optional[str] = None,
-        coverage: bool = True
+        coverage: bool = True,
+        fast: bool = False
     ) -> dict:
         """
         运行pytest测试套件
@@ -62,16 +154,16 @@ class TestRunner:
             test_path: 测试文件或目录路径
             markers: pytest标记过滤器 (例如: "not slow")
             coverage: 是否生成覆盖率报告
+            fast: 冒烟模式，跳过覆盖率，首个失败即停止
 
         Returns:
             包含测试结果的字典
         """
-        if not self.sandbox:
+        if not (self.sandbox or self.container):
             await self.setup_sandbox()
 
-        # 构建pytest命令
-        cmd_parts = [
-            "cd /app &&",
+        # 构建pytest命令（argv列表，直接执行，无需shell转义）
+        argv = [
             "pytest",
             test_path,
             "-v",  # 详细输出
@@ -80,46 +172,43 @@ class TestRunner:
         ]
 
         if markers:
-            cmd_parts.append(f"-m '{markers}'")
+            argv += ["-m", markers]
+
+        if fast:
+            # 覆盖率插桩会让pytest慢30-100%，冒烟测试不需要
+            coverage = False
+            argv += ["-x", "-p", "no:cacheprovider"]
 
         if coverage:
-            cmd_parts.extend([
+            argv.extend([
                 "--cov=src",
                 "--cov-report=html",
                 "--cov-report=term",
                 "--cov-report=json"
             ])
 
-        command = " ".join(cmd_parts)
-
         if self.verbose:
-            print(f"\n📝 执行命令: {command}\n")
+            print(f"\n📝 执行命令: {shlex.join(argv)}\n")
             print("=" * 70)
 
         # 运行测试
-        result = await self.sandbox.commands.run(command)
-
-        if self.verbose:
-            print(result.stdout)
-            if result.stderr:
-                print("\n⚠️ 标准错误输出:")
-                print(result.stderr)
+        exit_code, stdout, stderr = await self._exec(argv)
 
         # 解析测试结果
-        test_passed = result.exit_code == 0
+        test_passed = exit_code == 0
 
         if self.verbose:
             print("=" * 70)
             if test_passed:
                 print("✅ 所有测试通过！")
             else:
-                print(f"❌ 测试失败 (退出码: {result.exit_code})")
+                print(f"❌ 测试失败 (退出码: {exit_code})")
 
         return {
             "success": test_passed,
-            "exit_code": result.exit_code,
-            "stdout": result.stdout,
-            "stderr": result.stderr
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "stderr": stderr
         }
 
     async def download_coverage_report(self, output_dir: str = ".") -> bool:
@@ -132,7 +221,7 @@ class TestRunner:
         Returns:
             是否成功下载
         """
-        if not self.sandbox:
+        if not (self.sandbox or self.container):
             print("❌ 沙箱未初始化")
             return False
 
@@ -143,18 +232,30 @@ class TestRunner:
             output_path = Path(output_dir)
             output_path.mkdir(exist_ok=True)
 
-            # 下载HTML报告索引
-            html_report = await self.sandbox.files.read("/app/htmlcov/index.html")
-            with open(output_path / "coverage_report.html", "wb") as f:
-                f.write(html_report)
+            # 并发下载HTML报告索引和JSON报告
+            html_report, json_report = await asyncio.gather(
+                self._read_file(f"{self.workdir}/htmlcov/index.html"),
+                self._read_file(f"{self.workdir}/coverage.json"),
+                return_exceptions=True
+            )
+
+            if isinstance(html_report, Exception):
+                raise html_report
+
+            writes = [asyncio.to_thread(
+                (output_path / "coverage_report.html").write_bytes, html_report
+            )]
+            if not isinstance(json_report, Exception):
+                writes.append(asyncio.to_thread(
+                    (output_path / "coverage.json").write_bytes, json_report
+                ))
+            await asyncio.gather(*writes)
 
-            # 下载JSON报告
+            # 解析并显示覆盖率统计
             try:
-                json_report = await self.sandbox.files.read("/app/coverage.json")
-                with open(output_path / "coverage.json", "wb") as f:
-                    f.write(json_report)
+                if isinstance(json_report, Exception):
+                    raise json_report
 
-                # 解析并显示覆盖率统计
                 coverage_data = json.loads(json_report)
                 total_coverage = coverage_data.get("totals", {}).get("percent_covered", 0)
 
@@ -189,14 +290,26 @@ class TestRunner:
         """运行慢速测试（包括视觉模型测试）"""
         return await self.run_tests(markers="slow")
 
-    async def cleanup(self):
-        """清理沙箱资源"""
+    async def cleanup(self, wait_timeout: float = CLOSE_TIMEOUT_S):
+        """
+        清理沙箱资源
+
+        必须在事件循环结束前等到close()完成：asyncio.run()退出时会取消
+        未完成的任务，沙箱就会一直留到服务端超时。
+
+        Args:
+            wait_timeout: 最长等待秒数，超时后放弃关闭并给出提示
+        """
         if self.sandbox:
             if self.verbose:
                 print("\n🧹 清理沙箱...")
-            await self.sandbox.close()
-            if self.verbose:
-                print("✅ 清理完成")
+            try:
+                await asyncio.wait_for(self.sandbox.close(), wait_timeout)
+                if self.verbose:
+                    print("✅ 清理完成")
+            except asyncio.TimeoutError:
+                print(f"⚠️ 关闭沙箱超过{wait_timeout:.0f}秒，将由服务端超时回收")
+        self.container = None
 
 
 async def main():
@@ -231,6 +344,11 @@ async def main():
         action="store_true",
         help="禁用覆盖率报告"
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="冒烟模式：跳过覆盖率，首个失败即停止"
+    )
     parser.add_argument(
         "--output-dir",
         default=".",
@@ -251,6 +369,12 @@ async def main():
         action="store_true",
         help="静默模式"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["docker", "sandlock"],
+        default="docker",
+        help="沙箱后端：docker（OpenSandbox容器）或 sandlock（本地轻量沙箱）"
+    )
 
     args = parser.parse_args()
 
@@ -258,7 +382,8 @@ async def main():
     runner = TestRunner(
         image=args.image,
         timeout_minutes=args.timeout,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        backend=args.backend
     )
 
     try:
@@ -274,11 +399,12 @@ async def main():
             result = await runner.run_tests(
                 test_path=args.test_path,
                 markers=args.markers,
-                coverage=not args.no_coverage
+                coverage=not args.no_coverage,
+                fast=args.fast
             )
 
         # 下载覆盖率报告
-        if not args.no_coverage and result["success"]:
+        if not (args.no_coverage or args.fast) and result["success"]:
             await runner.download_coverage_report(args.output_dir)
 
         # 退出码
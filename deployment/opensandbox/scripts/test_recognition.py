@@ -5,13 +5,78 @@ NVDA Vision - 视觉识别测试脚本
 """
 
 from opensandbox import Sandbox
+from opensandbox.models.execd import RunCommandOpts
 from datetime import timedelta
 import asyncio
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List
 import json
 
+# orjson解析/序列化更快且直接输出UTF-8，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 缓存性能测试中热启动（缓存命中）的识别次数
+CACHE_WARM_RUNS = 5
+
+# 沙箱内测试图片目录
+SCREENSHOT_DIR = "/app/tests/fixtures/screenshots"
+
+# 沙箱内常驻的识别进程（脚本见 vision_worker.py）：只加载一次模型，之后通过本地HTTP接收识别请求
+WORKER_PORT = 8765
+WORKER_PATH = "/app/_vision_worker.py"
+WORKER_SCRIPT = Path(__file__).with_name("vision_worker.py")
+
+
+def _json_loads(data):
+    """解析JSON（优先orjson）"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _report_bytes(results: Dict) -> bytes:
+    """把测试结果序列化为缩进的UTF-8 JSON（阈值结果以float为键）"""
+    if orjson:
+        return orjson.dumps(
+            results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(results, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _read_into(local_path: Path, size: int) -> bytearray:
+    """按stat得到的大小预分配缓冲区，用readinto直接读入，不产生中间bytes"""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    with open(local_path, "rb", buffering=0) as f:
+        while offset < size:
+            n = f.readinto(view[offset:])
+            if not n:
+                break
+            offset += n
+    view.release()
+
+    # 读取期间文件被截断时丢弃多余部分
+    if offset < size:
+        del buf[offset:]
+    return buf
+
+
+def _read_test_image(local_path: Path):
+    """读取本地测试图片，返回 write_files 条目；文件不存在时返回None"""
+    # stat失败即视为不存在，省去单独的exists()检查
+    try:
+        st = local_path.stat()
+        content = _read_into(local_path, st.st_size)
+    except FileNotFoundError:
+        print(f"⚠️ 文件不存在: {local_path}")
+        return None
+
+    # write_files只接受bytes
+    return {"path": f"{SCREENSHOT_DIR}/{local_path.name}", "content": bytes(content)}
+
 
 class VisionTestRunner:
     """视觉识别测试运行器"""
@@ -26,6 +91,20 @@ class VisionTestRunner:
         self.timeout = timedelta(minutes=timeout_minutes)
         self.verbose = verbose
         self.sandbox = None
+        # 进度输出缓冲，每个测试阶段只写一次stdout
+        self._buf: List[str] = []
+
+    def _log(self, *lines: str):
+        """缓存进度输出（非verbose时丢弃）"""
+        if self.verbose:
+            self._buf.extend(lines)
+
+    def _flush(self):
+        """一次性写出缓存的进度输出"""
+        if self._buf:
+            sys.stdout.write("\n".join(self._buf) + "\n")
+            sys.stdout.flush()
+            self._buf.clear()
 
     async def setup_sandbox(self):
         """创建沙箱"""
@@ -42,39 +121,74 @@ class VisionTestRunner:
             }
         )
 
+        # 启动常驻识别进程，模型只在第一次请求时加载一次
+        await self.sandbox.files.write_files([{
+            "path": WORKER_PATH,
+            "content": await asyncio.to_thread(WORKER_SCRIPT.read_bytes)
+        }])
+        await self.sandbox.commands.run(
+            ["python", "-u", WORKER_PATH, str(WORKER_PORT)],
+            opts=RunCommandOpts(background=True, working_directory="/app")
+        )
+
         if self.verbose:
             print("✅ 沙箱创建成功\n")
 
-    async def upload_test_images(self, image_paths: List[str]):
-        """上传测试图片到沙箱"""
-        if self.verbose:
-            print(f"📤 上传 {len(image_paths)} 张测试图片...")
+    async def _rpc(self, request: Dict):
+        """
+        向常驻识别进程发送一个请求
 
-        for img_path in image_paths:
-            local_path = Path(img_path)
-            if not local_path.exists():
-                print(f"⚠️ 文件不存在: {img_path}")
-                continue
+        Args:
+            request: 请求字典，"op" 字段指定操作 (recognize / thresholds)
+
+        Returns:
+            解码后的响应
+        """
+        result = await self.sandbox.commands.run([
+            "curl", "-sS",
+            # 进程刚启动时端口可能尚未监听
+            "--retry", "30", "--retry-connrefused", "--retry-delay", "1",
+            "-H", "Content-Type: application/json",
+            "--data-binary", json.dumps(request, ensure_ascii=False),
+            f"http://127.0.0.1:{WORKER_PORT}/"
+        ])
+
+        if result.exit_code != 0:
+            raise RuntimeError(result.stderr)
+
+        return _json_loads(result.stdout)
+
+    async def upload_test_images(self, image_paths: Iterable[Path]):
+        """上传测试图片到沙箱"""
+        await self._push_remote(await self._read_local(image_paths))
 
-            with open(local_path, "rb") as f:
-                content = f.read()
-                remote_path = f"/app/tests/fixtures/screenshots/{local_path.name}"
+    async def _read_local(self, image_paths: Iterable[Path]) -> List[Dict]:
+        """在线程中读取本地测试图片（不依赖沙箱，可与沙箱创建并行）"""
+        # 同一路径只读取一次
+        unique_paths = list(dict.fromkeys(image_paths))
+        if self.verbose:
+            print(f"📤 读取 {len(unique_paths)} 张测试图片...")
 
-                await self.sandbox.files.write_files([{
-                    "path": remote_path,
-                    "content": content
-                }])
+        entries = await asyncio.gather(
+            *(asyncio.to_thread(_read_test_image, p) for p in unique_paths)
+        )
+        return [entry for entry in entries if entry is not None]
 
-                if self.verbose:
-                    print(f"  ✅ {local_path.name}")
+    async def _push_remote(self, entries: List[Dict]):
+        """一次RPC批量上传图片到沙箱"""
+        if entries:
+            await self.sandbox.files.write_files(entries)
 
         if self.verbose:
+            for entry in entries:
+                print(f"  ✅ {Path(entry['path']).name}")
             print()
 
     async def test_model_inference(
         self,
         model_name: str,
-        test_image: str
+        test_image: str,
+        report: bool = True
     ) -> Dict:
         """
         测试特定模型的推理能力
@@ -82,241 +196,175 @@ class VisionTestRunner:
         Args:
             model_name: 模型名称 (UI-TARS, MiniCPM-V, Doubao)
             test_image: 测试图片路径（沙箱内路径）
+            report: 是否立即打印结果（并发测试时由调用方统一打印）
 
         Returns:
             测试结果字典
         """
-        if self.verbose:
-            print(f"🔍 测试模型: {model_name}")
-            print(f"   图片: {test_image}")
+        if report:
+            self._log(f"🔍 测试模型: {model_name}", f"   图片: {test_image}")
+            self._flush()
 
-        # Python测试脚本
-        test_script = f'''
-import asyncio
-import json
-import time
-from src.vision_engine import VisionEngine
-from src.config import ConfigManager
-
-async def test_model():
-    config = ConfigManager()
-    engine = VisionEngine(config)
-
-    # 记录开始时间
-    start_time = time.time()
-
-    try:
-        # 执行识别
-        result = await engine.recognize(
-            "{test_image}",
-            preferred_model="{model_name}"
-        )
-
-        # 计算耗时
-        inference_time = time.time() - start_time
-
-        # 输出结果JSON
-        output = {{
-            "success": True,
-            "model": "{model_name}",
-            "inference_time": inference_time,
-            "elements_count": len(result.elements),
-            "average_confidence": result.average_confidence,
-            "elements": [
-                {{
-                    "type": elem.type,
-                    "text": elem.text,
-                    "confidence": elem.confidence,
-                    "bbox": elem.bbox
-                }}
-                for elem in result.elements[:10]  # 前10个元素
-            ]
-        }}
-
-        print(json.dumps(output, ensure_ascii=False, indent=2))
-
-    except Exception as e:
-        output = {{
-            "success": False,
-            "model": "{model_name}",
-            "error": str(e)
-        }}
-        print(json.dumps(output, ensure_ascii=False, indent=2))
-
-asyncio.run(test_model())
-'''
-
-        # 在沙箱中运行
-        result = await self.sandbox.commands.run(
-            f"cd /app && python -c '{test_script}'"
-        )
-
-        if result.exit_code != 0:
-            if self.verbose:
-                print(f"❌ 测试失败:")
-                print(result.stderr)
-            return {"success": False, "error": result.stderr}
-
-        # 解析JSON输出
         try:
-            output = json.loads(result.stdout)
-
-            if self.verbose and output.get("success"):
-                print(f"✅ 识别成功!")
-                print(f"   推理时间: {output['inference_time']:.2f}秒")
-                print(f"   识别元素: {output['elements_count']}个")
-                print(f"   平均置信度: {output['average_confidence']:.2%}\n")
-
-                # 显示前5个元素
-                if output.get("elements"):
-                    print("   前5个元素:")
-                    for i, elem in enumerate(output["elements"][:5], 1):
-                        print(f"     {i}. {elem['type']}: {elem['text'][:30]} "
-                              f"(置信度: {elem['confidence']:.2%})")
-                    print()
-
-            return output
+            output = await self._rpc({
+                "op": "recognize",
+                "image": test_image,
+                "model": model_name
+            })
+        except (RuntimeError, json.JSONDecodeError) as e:
+            output = {"success": False, "error": str(e)}
+
+        if report:
+            self._print_inference(output)
+            self._flush()
+        return output
+
+    def _print_inference(self, output: Dict):
+        """缓存单个模型的识别结果输出"""
+        if not self.verbose:
+            return
+
+        if output.get("success"):
+            self._log(
+                "✅ 识别成功!",
+                f"   推理时间: {output['inference_time']:.2f}秒",
+                f"   识别元素: {output['elements_count']}个",
+                f"   平均置信度: {output['average_confidence']:.2%}\n"
+            )
 
-        except json.JSONDecodeError:
-            if self.verbose:
-                print(f"⚠️ 无法解析输出:")
-                print(result.stdout)
-            return {"success": False, "error": "Invalid JSON output"}
+            # 显示前5个元素
+            if output.get("elements"):
+                self._log("   前5个元素:")
+                self._log(*(
+                    f"     {i}. {elem['type']}: {elem['text'][:30]} "
+                    f"(置信度: {elem['confidence']:.2%})"
+                    for i, elem in enumerate(output["elements"][:5], 1)
+                ))
+                self._log("")
+        else:
+            self._log("❌ 测试失败:", str(output.get("error")))
 
     async def test_all_models(self, test_image: str) -> Dict[str, Dict]:
         """测试所有可用模型"""
         models = ["UI-TARS", "MiniCPM-V", "Doubao"]
         results = {}
 
-        if self.verbose:
-            print("=" * 70)
-            print("🧪 测试所有视觉模型")
-            print("=" * 70)
-            print()
-
-        for model in models:
-            try:
-                result = await self.test_model_inference(model, test_image)
-                results[model] = result
-            except Exception as e:
-                if self.verbose:
-                    print(f"❌ {model} 测试失败: {e}\n")
-                results[model] = {"success": False, "error": str(e)}
+        self._log("=" * 70, "🧪 测试所有视觉模型", "=" * 70, "")
+        self._flush()
 
+        # 三个请求并发发出，但常驻识别进程是单线程HTTPServer，推理仍逐个
+        # 执行（也因此各模型的推理耗时互不干扰），并发只重叠了沙箱命令的
+        # 往返开销。任一任务抛出异常（如沙箱失联）时取消其余任务
+        tasks = {}
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for model in models:
+                    tasks[model] = tg.create_task(
+                        self.test_model_inference(model, test_image, report=False)
+                    )
+        except* Exception:
+            pass  # 异常在下面逐个转换为各模型的错误结果
+
+        for model, task in tasks.items():
+            if task.cancelled() or task.exception() is not None:
+                error = "已取消" if task.cancelled() else str(task.exception())
+                self._log(f"❌ {model} 测试失败: {error}\n")
+                result = {"success": False, "error": error}
+            else:
+                result = task.result()
+                self._log(f"🔍 测试模型: {model}", f"   图片: {test_image}")
+                self._print_inference(result)
+            results[model] = result
+
+        self._flush()
         return results
 
-    async def test_cache_performance(self, test_image: str):
-        """测试缓存性能"""
-        if self.verbose:
-            print("=" * 70)
-            print("⚡ 测试缓存性能")
-            print("=" * 70)
-            print()
-
-        # 第一次识别（无缓存）
-        if self.verbose:
-            print("📊 第一次识别（冷启动）...")
-
-        result1 = await self.test_model_inference("UI-TARS", test_image)
-        time1 = result1.get("inference_time", 0)
+    async def test_cache_performance(
+        self,
+        test_image: str,
+        warm_runs: int = CACHE_WARM_RUNS
+    ):
+        """
+        测试缓存性能
 
-        # 启用缓存
-        await self.sandbox.commands.run(
-            "export CACHE_ENABLED=true"
-        )
+        在常驻进程内新建一个开启缓存的引擎，先做一次冷启动识别（含模型加载），
+        再做warm_runs次缓存命中识别；常驻引擎的缓存保持关闭。
 
-        # 第二次识别（有缓存）
-        if self.verbose:
-            print("📊 第二次识别（缓存命中）...")
-
-        result2 = await self.test_model_inference("UI-TARS", test_image)
-        time2 = result2.get("inference_time", 0)
+        Args:
+            test_image: 测试图片路径（沙箱内路径）
+            warm_runs: 缓存命中识别的次数
+        """
+        self._log("=" * 70, "⚡ 测试缓存性能", "=" * 70, "",
+                  f"📊 冷启动1次 + 缓存命中{warm_runs}次...")
+        self._flush()
 
-        if self.verbose and time1 > 0 and time2 > 0:
-            speedup = time1 / time2
-            print(f"\n🚀 缓存加速比: {speedup:.1f}x")
-            print(f"   无缓存: {time1:.2f}秒")
-            print(f"   有缓存: {time2:.2f}秒")
-            print(f"   节省: {(time1 - time2):.2f}秒\n")
+        try:
+            result = await self._rpc({
+                "op": "cache_benchmark",
+                "image": test_image,
+                "model": "UI-TARS",
+                "warm_runs": warm_runs
+            })
+        except (RuntimeError, json.JSONDecodeError) as e:
+            self._log(f"❌ 缓存测试失败: {e}\n")
+            self._flush()
+            return {"success": False, "error": str(e)}
+
+        cold, warm_min = result["cold"], result["warm_min"]
+        result["speedup"] = cold / warm_min if cold > 0 and warm_min > 0 else 0
+
+        if result["speedup"]:
+            self._log(
+                f"\n🚀 缓存加速比: {result['speedup']:.1f}x",
+                f"   无缓存: {cold:.2f}秒",
+                f"   有缓存: 最快{warm_min:.3f}秒 / 平均{result['warm_mean']:.3f}秒",
+                f"   节省: {(cold - warm_min):.2f}秒\n"
+            )
+            self._flush()
 
-        return {
-            "cold_start": result1,
-            "cached": result2,
-            "speedup": time1 / time2 if time1 > 0 and time2 > 0 else 0
-        }
+        return result
 
     async def test_confidence_thresholds(self, test_image: str):
         """测试不同置信度阈值下的识别结果"""
-        if self.verbose:
-            print("=" * 70)
-            print("🎯 测试置信度阈值")
-            print("=" * 70)
-            print()
+        self._log("=" * 70, "🎯 测试置信度阈值", "=" * 70, "")
+        self._flush()
 
         thresholds = [0.5, 0.6, 0.7, 0.8, 0.9]
         results = {}
 
-        for threshold in thresholds:
-            if self.verbose:
-                print(f"📊 测试阈值: {threshold:.0%}")
-
-            test_script = f'''
-import asyncio
-import json
-from src.vision_engine import VisionEngine
-from src.config import ConfigManager
-
-async def test():
-    config = ConfigManager()
-    config.set("models.confidence_threshold", {threshold})
-    engine = VisionEngine(config)
-
-    result = await engine.recognize("{test_image}")
+        # 常驻进程中模型已加载，在进程内遍历所有阈值
+        outputs = await self._rpc({
+            "op": "thresholds",
+            "image": test_image,
+            "thresholds": thresholds
+        })
 
-    # 统计不同置信度区间的元素
-    high = sum(1 for e in result.elements if e.confidence >= 0.8)
-    medium = sum(1 for e in result.elements if 0.6 <= e.confidence < 0.8)
-    low = sum(1 for e in result.elements if e.confidence < 0.6)
+        for output in outputs:
+            threshold = output["threshold"]
+            results[threshold] = output
 
-    output = {{
-        "threshold": {threshold},
-        "total_elements": len(result.elements),
-        "high_confidence": high,
-        "medium_confidence": medium,
-        "low_confidence": low
-    }}
-
-    print(json.dumps(output, indent=2))
-
-asyncio.run(test())
-'''
+            if "error" in output:
+                self._log(f"❌ 阈值 {threshold:.0%} 测试失败: {output['error']}\n")
+                continue
 
-            result = await self.sandbox.commands.run(
-                f"cd /app && python -c '{test_script}'"
+            self._log(
+                f"📊 测试阈值: {threshold:.0%}",
+                f"   总元素: {output['total_elements']}",
+                f"   高置信度(≥80%): {output['high_confidence']}",
+                f"   中等(60-80%): {output['medium_confidence']}",
+                f"   低(<60%): {output['low_confidence']}\n"
             )
 
-            if result.exit_code == 0:
-                try:
-                    output = json.loads(result.stdout)
-                    results[threshold] = output
-
-                    if self.verbose:
-                        print(f"   总元素: {output['total_elements']}")
-                        print(f"   高置信度(≥80%): {output['high_confidence']}")
-                        print(f"   中等(60-80%): {output['medium_confidence']}")
-                        print(f"   低(<60%): {output['low_confidence']}\n")
-
-                except json.JSONDecodeError:
-                    pass
-
+        self._flush()
         return results
 
     async def generate_report(self, results: Dict, output_file: str = "vision_test_report.json"):
         """生成测试报告"""
         report_path = Path(output_file)
 
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        # 序列化和写盘都放到线程中，不阻塞事件循环
+        payload = await asyncio.to_thread(_report_bytes, results)
+        await asyncio.to_thread(report_path.write_bytes, payload)
 
         if self.verbose:
             print(f"📝 测试报告已保存: {report_path}")
@@ -388,15 +436,20 @@ async def main():
         verbose=not args.quiet
     )
 
+    test_paths = [Path(p) for p in args.test_images]
+
     try:
-        # 设置沙箱
-        await runner.setup_sandbox()
+        # 创建沙箱的同时读取本地测试图片
+        _, entries = await asyncio.gather(
+            runner.setup_sandbox(),
+            runner._read_local(test_paths)
+        )
 
         # 上传测试图片
-        await runner.upload_test_images(args.test_images)
+        await runner._push_remote(entries)
 
         # 使用第一张图片进行测试
-        test_image = f"/app/tests/fixtures/screenshots/{Path(args.test_images[0]).name}"
+        test_image = f"{SCREENSHOT_DIR}/{test_paths[0].name}"
 
         results = {}
 
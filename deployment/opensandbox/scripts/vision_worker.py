@@ -0,0 +1,179 @@
+"""
+NVDA Vision - 沙箱内常驻识别进程
+
+由 test_recognition.py 上传到沙箱并在后台启动，只加载一次视觉模型，
+之后通过本地HTTP接收JSON识别请求。HTTPServer是单线程的，请求按到达
+顺序逐个处理（共享一个引擎，不做并发推理）。
+
+用法（沙箱内）:
+    python -u /app/_vision_worker.py <端口>
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.vision_engine import VisionEngine
+from src.config import ConfigManager
+
+loop = asyncio.new_event_loop()
+config = None
+engine = None
+
+
+def get_engine():
+    """首次请求时加载模型，之后一直复用"""
+    global config, engine
+    if engine is None:
+        config = ConfigManager()
+        engine = VisionEngine(config)
+    return engine
+
+
+@contextlib.contextmanager
+def config_overrides(settings: dict):
+    """
+    临时修改常驻引擎的配置项，请求结束后恢复原值
+
+    常驻进程在多个测试间共享，任何请求都不能把配置留给下一个请求。
+    """
+    get_engine()
+    saved = {key: config.get(key) for key in settings}
+    try:
+        for key, value in settings.items():
+            config.set(key, value)
+        yield
+    finally:
+        for key, value in saved.items():
+            config.set(key, value)
+
+
+async def recognize(req):
+    """识别单张图片，返回结果摘要"""
+    engine = get_engine()
+    start_time = time.time()
+
+    try:
+        result = await engine.recognize(
+            req["image"],
+            preferred_model=req.get("model")
+        )
+        inference_time = time.time() - start_time
+
+        return {
+            "success": True,
+            "model": req.get("model"),
+            "inference_time": inference_time,
+            "elements_count": len(result.elements),
+            "average_confidence": result.average_confidence,
+            "elements": [
+                {
+                    "type": elem.type,
+                    "text": elem.text,
+                    "confidence": elem.confidence,
+                    "bbox": elem.bbox
+                }
+                for elem in result.elements[:10]  # 前10个元素
+            ]
+        }
+
+    except Exception as e:
+        return {"success": False, "model": req.get("model"), "error": str(e)}
+
+
+async def sweep_thresholds(req):
+    """在同一引擎上遍历多个置信度阈值"""
+    engine = get_engine()
+    outputs = []
+
+    for threshold in req["thresholds"]:
+        try:
+            with config_overrides({"models.confidence_threshold": threshold}):
+                result = await engine.recognize(req["image"])
+        except Exception as e:
+            # 失败的阈值也写进报告，注明原因
+            outputs.append({"threshold": threshold, "error": str(e)})
+            continue
+
+        # 统计不同置信度区间的元素
+        high = sum(1 for e in result.elements if e.confidence >= 0.8)
+        medium = sum(1 for e in result.elements if 0.6 <= e.confidence < 0.8)
+        low = sum(1 for e in result.elements if e.confidence < 0.6)
+
+        outputs.append({
+            "threshold": threshold,
+            "total_elements": len(result.elements),
+            "high_confidence": high,
+            "medium_confidence": medium,
+            "low_confidence": low
+        })
+
+    return outputs
+
+
+async def cache_benchmark(req):
+    """
+    在独立的新引擎上测量一次冷启动和多次缓存命中的耗时
+
+    冷启动包含模型加载（与原先每次新进程的测量口径一致）。缓存只对这个
+    临时引擎开启，常驻引擎保持沙箱默认的关闭状态，后续请求不会读到缓存结果。
+    """
+    saved_env = os.environ.get("CACHE_ENABLED")
+    os.environ["CACHE_ENABLED"] = "true"
+    try:
+        bench_config = ConfigManager()
+        bench_config.set("cache.enabled", True)
+
+        timings = []
+        start_time = time.time()
+        bench_engine = VisionEngine(bench_config)
+        for _ in range(1 + req["warm_runs"]):
+            await bench_engine.recognize(req["image"], preferred_model=req.get("model"))
+            timings.append(time.time() - start_time)
+            start_time = time.time()
+    finally:
+        if saved_env is None:
+            os.environ.pop("CACHE_ENABLED", None)
+        else:
+            os.environ["CACHE_ENABLED"] = saved_env
+
+    cold, warm = timings[0], timings[1:]
+    return {
+        "cold": cold,
+        "warm_mean": sum(warm) / len(warm),
+        "warm_min": min(warm),
+        "warm_runs": len(warm)
+    }
+
+
+HANDLERS = {
+    "recognize": recognize,
+    "thresholds": sweep_thresholds,
+    "cache_benchmark": cache_benchmark,
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """把POST请求体中的JSON分发给对应的操作"""
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        resp = loop.run_until_complete(HANDLERS[req["op"]](req))
+
+        body = json.dumps(resp, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+if __name__ == "__main__":
+    HTTPServer(("127.0.0.1", int(sys.argv[1])), Handler).serve_forever()
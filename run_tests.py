@@ -12,13 +12,13 @@ import sys
 import argparse
 from pathlib import Path
 
-# Add src to Python path
 project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root / "src" / "addon" / "globalPlugins"))
 
 
 def run_integration_tests():
     """Run integration tests"""
+    # Add src to Python path and import lazily, so --unit/--help stay cheap
+    sys.path.insert(0, str(project_root / "src" / "addon" / "globalPlugins"))
     from tests.integration.test_mas1_e2e import run_tests
     return run_tests()
 
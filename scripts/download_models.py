@@ -121,6 +121,19 @@ inference_timeout: 15.0
     return config_path
 
 
+def _is_nonempty_dir(path):
+    """Return True if path is a directory containing at least one entry.
+
+    Uses a single scandir() call that stops at the first entry instead of
+    an exists() check followed by iterdir().
+    """
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
 def check_installation():
     """Check which models are installed."""
     print("=" * 60)
@@ -138,7 +151,7 @@ def check_installation():
     missing = []
 
     for name, path in models.items():
-        if path.exists() and any(path.iterdir()):
+        if _is_nonempty_dir(path):
             installed.append(name)
             print(f"✓ {name} - Installed")
             print(f"  Location: {path}")
@@ -13,9 +13,6 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src" / "addon" / "globalPlugins" / "nvdaVision"))
 
-from infrastructure.config_loader import ConfigManager
-from infrastructure.logger import setup_logger, logger
-
 
 def setup_api_key():
     """交互式配置API密钥。"""
@@ -46,6 +43,10 @@ def setup_api_key():
             print("已取消")
             return False
 
+    # 延迟导入：配置和日志模块较重，输入校验失败时无需加载
+    from infrastructure.config_loader import ConfigManager
+    from infrastructure.logger import setup_logger, logger
+
     # 初始化配置管理器
     try:
         config_dir = Path.home() / ".nvda_vision"
@@ -14,18 +14,115 @@ import addonHandler
 import ui
 import api
 import scriptHandler
-from pathlib import Path
-
-from .constants import __version__
-from .infrastructure import logger, setup_logger, ConfigManager
+import importlib
+import functools
+import threading
+
+from .constants import (
+    __version__,
+    LOW_CONFIDENCE_THRESHOLD,
+    SIMILAR_SCREENSHOT_MAX_DISTANCE,
+    DEFAULT_LOG_DIR,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_MODEL_DIR,
+)
+from . import _wininput
+from .infrastructure import logger, setup_logger, shutdown_logger, ConfigManager
 from .services import ScreenshotService, CacheManager, VisionEngine, ResultProcessor
 from .models import ModelDetector
-from .core import RecognitionController
+from .core import RecognitionController, RecognitionPrefetcher
 from .schemas import Screenshot, RecognitionResult
 
 # Initialize translation support
 addonHandler.initTranslation()
 
+# Fixed gesture messages, translated once at import
+_MSG_UNAVAILABLE = _("NVDA Vision is not available")
+_MSG_NO_MODELS = _("No vision models available. Please install models.")
+_MSG_IN_PROGRESS = _("Recognition already in progress")
+_MSG_RECOGNIZING = _("Recognizing screen...")
+_MSG_START_FAILED = _("Recognition failed to start")
+_MSG_STATS_FAILED = _("Failed to get cache statistics")
+_MSG_CACHE_CLEARED = _("Cache cleared")
+_MSG_CLEAR_FAILED = _("Failed to clear cache")
+_MSG_NO_MORE = _("No more elements")
+_MSG_NO_PREVIOUS = _("No previous elements")
+_MSG_NAVIGATION_FAILED = _("Navigation failed")
+_MSG_NO_ELEMENT = _("No element to activate")
+_MSG_ACTIVATION_CANCELLED = _("Activation cancelled")
+_MSG_COORDS_INVALID = _("Element coordinates invalid")
+_MSG_OUT_OF_BOUNDS = _("Element coordinates out of screen bounds")
+_MSG_NO_PYAUTOGUI = _("pyautogui not installed")
+_MSG_ACTIVATION_FAILED = _("Activation failed")
+_MSG_ACTIVATION_ERROR = _("Activation error")
+
+# Templates still formatted per call, but looked up once
+_TPL_NOT_ACTIONABLE = _("Element not actionable: {type}")
+_TPL_ACTIVATED = _("Activated: {text}")
+
+# Adapter name used to pick the cloud fallback out of detected adapters
+_CLOUD_ADAPTER_NAME = "Doubao Cloud API"
+
+# Heavy or NVDA-runtime modules used by gestures, imported on first use
+_lazy_modules = {}
+
+
+def _lazy(name: str):
+    """Import a module once and return the cached module object.
+
+    Raises:
+        ImportError: If the module is not available
+    """
+    module = _lazy_modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+        if name == "pyautogui":
+            _configure_pyautogui(module)
+        _lazy_modules[name] = module
+    return module
+
+
+def _configure_pyautogui(pyautogui):
+    """Disable pyautogui's per-call pause and fail-safe check.
+
+    By default every action sleeps PAUSE (0.1s) afterwards and checks the
+    fail-safe corner, both inside NVDA's script handler.
+    """
+    pyautogui.PAUSE = 0
+    pyautogui.FAILSAFE = False
+    pyautogui.MINIMUM_DURATION = 0
+    pyautogui.MINIMUM_SLEEP = 0
+
+
+# Gesture-path modules imported ahead of the first gesture
+_WARMUP_MODULES = ("pyautogui", "win32api")
+
+# Warmed up as well when a local model adapter can run
+_LOCAL_MODEL_WARMUP_MODULES = ("torch",)
+
+
+def _warmup_imports(modules):
+    """Import gesture-path modules in the background.
+
+    Runs concurrently with model detection and loading so the first
+    activate gesture doesn't pay the import cost.
+
+    Args:
+        modules: Names of the modules to import
+    """
+    for name in modules:
+        try:
+            _lazy(name)
+        except Exception as e:
+            logger.debug("Warmup import of {} skipped: {}", name, e)
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_dirs():
+    """Create the plugin's data directories once per session."""
+    for directory in (DEFAULT_LOG_DIR, DEFAULT_CACHE_DIR, DEFAULT_MODEL_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     """NVDA Vision global plugin.
@@ -43,11 +140,19 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         # Plugin state
         self.enabled = False  # Default to disabled until init succeeds
         self.is_recognizing = False
+        self.prefetcher = None
+
+        # Whether our settings panel is in NVDASettingsDialog.categoryClasses
+        self._panel_registered = False
+
+        # Screen size, refreshed on WM_DISPLAYCHANGE (None = not cached)
+        self._screen_bounds = None
+        self._display_change_bound = False
 
         try:
             # Setup logging first
-            log_dir = Path.home() / ".nvda_vision" / "logs"
-            setup_logger(log_dir=log_dir, level="INFO")
+            _ensure_dirs()
+            setup_logger(log_dir=DEFAULT_LOG_DIR, level="INFO")
             logger.info(f"NVDA Vision plugin v{__version__} initializing...")
 
             # Load configuration
@@ -57,19 +162,30 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             # Initialize services
             self.screenshot_service = ScreenshotService()
 
-            cache_dir = Path.home() / ".nvda_vision" / "cache"
             self.cache_manager = CacheManager(
-                cache_dir=cache_dir,
+                cache_dir=DEFAULT_CACHE_DIR,
                 ttl_seconds=self.config.get("cache.ttl_seconds", 300),
-                max_size=self.config.get("cache.max_size", 1000)
+                max_size=self.config.get("cache.max_size", 1000),
+                fuzzy_hamming_threshold=self.config.get(
+                    "cache.fuzzy_hamming_threshold",
+                    SIMILAR_SCREENSHOT_MAX_DISTANCE
+                )
             )
 
             # Initialize model detector and vision engine
-            model_dir = Path.home() / ".nvda_vision" / "models"
-            model_dir.mkdir(parents=True, exist_ok=True)
-
             logger.info("Detecting available vision models...")
-            detector = ModelDetector(model_dir, self.config.config)
+            detector = ModelDetector(DEFAULT_MODEL_DIR, self.config.config)
+
+            # torch is only worth importing when a local model may load
+            warmup_modules = _WARMUP_MODULES
+            if detector.has_local_models():
+                warmup_modules += _LOCAL_MODEL_WARMUP_MODULES
+            threading.Thread(
+                target=_warmup_imports,
+                args=(warmup_modules,),
+                daemon=True,
+                name="NVDAVisionWarmup"
+            ).start()
 
             # Get all available adapters
             try:
@@ -82,16 +198,14 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 else:
                     # Use first adapter as primary, rest as backups
                     primary = adapters[0]
-                    backups = adapters[1:] if len(adapters) > 1 else []
 
-                    # Find cloud adapter if exists
-                    cloud_adapter = None
-                    for adapter in adapters:
-                        if adapter.name == "Doubao Cloud API":
-                            cloud_adapter = adapter
-                            if adapter in backups:
-                                backups.remove(adapter)
-                            break
+                    # Find cloud adapter if exists (first match wins)
+                    by_name = {adapter.name: adapter for adapter in reversed(adapters)}
+                    cloud_adapter = by_name.get(_CLOUD_ADAPTER_NAME)
+                    backups = [
+                        adapter for adapter in adapters[1:]
+                        if adapter is not cloud_adapter
+                    ]
 
                     # Initialize vision engine
                     enable_cloud = self.config.get("enable_cloud_api", False)
@@ -126,6 +240,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 config=self.config.config
             )
 
+            # Optional background prefetch (opt-in: it captures the screen
+            # periodically, which matters when the cloud API is enabled)
+            if self.vision_engine and self.config.get("prefetch.enabled", False):
+                self.prefetcher = RecognitionPrefetcher(
+                    controller=self.recognition_controller,
+                    screenshot_service=self.screenshot_service,
+                    capacity=self.config.get("prefetch.capacity", 4),
+                    poll_interval=self.config.get("prefetch.poll_interval", 2.0)
+                )
+                self.prefetcher.start()
+
             logger.info("All services initialized successfully")
 
             # Mark as enabled
@@ -136,16 +261,28 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 import gui.settingsDialogs
                 from .ui import NVDAVisionSettingsPanel
 
-                # 将设置面板添加到NVDA设置对话框
-                gui.settingsDialogs.NVDASettingsDialog.categoryClasses.append(
-                    NVDAVisionSettingsPanel
-                )
-                logger.info("Settings panel registered to NVDA Settings dialog")
+                # 将设置面板添加到NVDA设置对话框（标志位避免重复注册）
+                if not self._panel_registered:
+                    gui.settingsDialogs.NVDASettingsDialog.categoryClasses.append(
+                        NVDAVisionSettingsPanel
+                    )
+                    self._panel_registered = True
+                    logger.info("Settings panel registered to NVDA Settings dialog")
 
             except Exception as e:
                 logger.exception("Failed to register settings panel")
                 # 不影响插件主功能，继续运行
 
+            # Invalidate cached screen size when the display changes
+            try:
+                import gui
+                wx = _lazy("wx")
+                gui.mainFrame.Bind(wx.EVT_DISPLAY_CHANGED, self._on_display_changed)
+                self._display_change_bound = True
+
+            except Exception as e:
+                logger.warning(f"Failed to watch display changes: {e}")
+
             # Announce ready
             ui.message("NVDA Vision initialized")
             logger.info("NVDA Vision plugin initialized successfully")
@@ -165,18 +302,39 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
         try:
             # Remove settings panel from NVDA settings dialog
-            try:
-                import gui.settingsDialogs
-                from .ui import NVDAVisionSettingsPanel
+            if self._panel_registered:
+                try:
+                    import gui.settingsDialogs
+                    from .ui import NVDAVisionSettingsPanel
 
-                if NVDAVisionSettingsPanel in gui.settingsDialogs.NVDASettingsDialog.categoryClasses:
                     gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(
                         NVDAVisionSettingsPanel
                     )
                     logger.info("Settings panel removed from NVDA Settings dialog")
 
-            except Exception as e:
-                logger.exception("Failed to remove settings panel")
+                except ValueError:
+                    logger.warning("Settings panel was already removed")
+
+                except Exception as e:
+                    logger.exception("Failed to remove settings panel")
+
+                finally:
+                    self._panel_registered = False
+
+            # Stop watching display changes
+            if self._display_change_bound:
+                try:
+                    import gui
+                    gui.mainFrame.Unbind(
+                        _lazy("wx").EVT_DISPLAY_CHANGED,
+                        handler=self._on_display_changed
+                    )
+                except Exception as e:
+                    logger.exception("Failed to unbind display change handler")
+
+            # Stop prefetching before models are unloaded
+            if self.prefetcher:
+                self.prefetcher.stop()
 
             # Unload vision models
             if hasattr(self, 'vision_engine') and self.vision_engine:
@@ -198,6 +356,9 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             logger.exception("Error during plugin termination")
 
         finally:
+            # Flush queued log records and stop the writer threads
+            shutdown_logger()
+
             # Always call super().terminate()
             super().terminate()
 
@@ -213,17 +374,26 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             if not self.vision_engine:
-                ui.message(_("No vision models available. Please install models."))
+                ui.message(_MSG_NO_MODELS)
                 return
 
             if self.is_recognizing:
-                ui.message(_("Recognition already in progress"))
+                ui.message(_MSG_IN_PROGRESS)
                 return
 
+            # Use a prefetched result for the current screen if available
+            if self.prefetcher:
+                result = self.prefetcher.take()
+                if result:
+                    logger.info("Using prefetched recognition result")
+                    self.recognition_controller.set_current_result(result)
+                    self._on_recognition_complete(result)
+                    return
+
             # Mark as recognizing
             self.is_recognizing = True
 
@@ -234,13 +404,13 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             )
 
             # Immediate feedback
-            ui.message(_("Recognizing screen..."))
+            ui.message(_MSG_RECOGNIZING)
             logger.info("Recognition started")
 
         except Exception as e:
             # Catch all exceptions to prevent NVDA crash
             logger.exception("Error in script_recognizeScreen")
-            ui.message(_("Recognition failed to start"))
+            ui.message(_MSG_START_FAILED)
             self.is_recognizing = False
 
     @scriptHandler.script(
@@ -252,7 +422,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """Show cache statistics."""
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             stats = self.cache_manager.get_stats()
@@ -266,11 +436,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             )
 
             ui.message(message)
-            logger.info(f"Cache stats requested: {message}")
+            logger.info("Cache stats requested: {}", message)
 
         except Exception as e:
             logger.exception("Failed to get cache stats")
-            ui.message(_("Failed to get cache statistics"))
+            ui.message(_MSG_STATS_FAILED)
 
     @scriptHandler.script(
         description=_("Clear recognition cache"),
@@ -281,16 +451,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """Clear recognition cache."""
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             self.cache_manager.clear()
-            ui.message(_("Cache cleared"))
+            self.recognition_controller.clear_memory_cache()
+            ui.message(_MSG_CACHE_CLEARED)
             logger.info("Cache cleared by user")
 
         except Exception as e:
             logger.exception("Failed to clear cache")
-            ui.message(_("Failed to clear cache"))
+            ui.message(_MSG_CLEAR_FAILED)
 
     @scriptHandler.script(
         description=_("Navigate to next UI element"),
@@ -301,7 +472,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """Navigate to next UI element."""
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             element = self.recognition_controller.get_next_element()
@@ -309,11 +480,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             if element:
                 self._speak_element(element)
             else:
-                ui.message(_("No more elements"))
+                ui.message(_MSG_NO_MORE)
 
         except Exception as e:
             logger.exception("Error navigating to next element")
-            ui.message(_("Navigation failed"))
+            ui.message(_MSG_NAVIGATION_FAILED)
 
     @scriptHandler.script(
         description=_("Navigate to previous UI element"),
@@ -324,7 +495,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """Navigate to previous UI element."""
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             element = self.recognition_controller.get_previous_element()
@@ -332,11 +503,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             if element:
                 self._speak_element(element)
             else:
-                ui.message(_("No previous elements"))
+                ui.message(_MSG_NO_PREVIOUS)
 
         except Exception as e:
             logger.exception("Error navigating to previous element")
-            ui.message(_("Navigation failed"))
+            ui.message(_MSG_NAVIGATION_FAILED)
 
     @scriptHandler.script(
         description=_("Activate current UI element"),
@@ -350,42 +521,41 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         - Checks element actionability
         - Validates bbox coordinates
         - Shows confirmation for low-confidence elements
-        - Uses pyautogui for mouse simulation
+        - Clicks via SendInput (pyautogui fallback)
         - Provides voice feedback
         - Satisfies real.md constraint 3 (confidence transparency)
         """
         try:
             if not self.enabled:
-                ui.message(_("NVDA Vision is not available"))
+                ui.message(_MSG_UNAVAILABLE)
                 return
 
             # Get current element
             element = self.recognition_controller.get_current_element()
 
             if not element:
-                ui.message(_("No element to activate"))
+                ui.message(_MSG_NO_ELEMENT)
                 logger.info("Activation failed: no current element")
                 return
 
             # Check if element is actionable
             if not element.actionable:
                 ui.message(
-                    _("Element not actionable: {type}").format(
+                    _TPL_NOT_ACTIONABLE.format(
                         type=element.element_type
                     )
                 )
                 logger.info(
-                    f"Activation skipped: element not actionable "
-                    f"({element.element_type})"
+                    "Activation skipped: element not actionable ({})",
+                    element.element_type
                 )
                 return
 
             # Low confidence warning (real.md constraint 3)
-            from .constants import LOW_CONFIDENCE_THRESHOLD
             if element.confidence < LOW_CONFIDENCE_THRESHOLD:
                 # Ask for confirmation
                 try:
-                    import wx
+                    wx = _lazy("wx")
                     dlg = wx.MessageDialog(
                         None,
                         _("This element has low confidence ({conf:.0%}).\n"
@@ -404,7 +574,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                     dlg.Destroy()
 
                     if result != wx.ID_YES:
-                        ui.message(_("Activation cancelled"))
+                        ui.message(_MSG_ACTIVATION_CANCELLED)
                         logger.info("User cancelled low-confidence activation")
                         return
 
@@ -420,69 +590,93 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             # Validate bbox
             bbox = element.bbox
             if not bbox or len(bbox) != 4:
-                ui.message(_("Element coordinates invalid"))
-                logger.error(f"Invalid bbox: {bbox}")
+                ui.message(_MSG_COORDS_INVALID)
+                logger.error("Invalid bbox: {}", bbox)
                 return
 
-            x1, y1, x2, y2 = bbox
+            # Calculate click position (center of bbox)
+            click_x = element.center_x
+            click_y = element.center_y
 
             # Check bbox is within screen bounds
             try:
-                import win32api
-                screen_width = win32api.GetSystemMetrics(0)
-                screen_height = win32api.GetSystemMetrics(1)
-
-                if not (0 <= x1 < x2 <= screen_width and
-                        0 <= y1 < y2 <= screen_height):
-                    ui.message(_("Element coordinates out of screen bounds"))
-                    logger.error(
-                        f"Bbox out of bounds: {bbox}, "
-                        f"screen: {screen_width}x{screen_height}"
-                    )
-                    return
+                screen_width, screen_height = self._get_screen_bounds()
 
-            except Exception as e:
-                logger.warning(f"Failed to check screen bounds: {e}")
+                # Centers and bounds checks are computed once per result
+                geometry = self.recognition_controller.get_current_geometry(
+                    screen_width, screen_height
+                )
+                if geometry:
+                    click_x, click_y, in_bounds = geometry
+                    if not in_bounds:
+                        ui.message(_MSG_OUT_OF_BOUNDS)
+                        logger.error(
+                            "Bbox out of bounds: {}, screen: {}x{}",
+                            bbox, screen_width, screen_height
+                        )
+                        return
 
-            # Calculate click position (center of bbox)
-            click_x = (x1 + x2) // 2
-            click_y = (y1 + y2) // 2
+            except Exception as e:
+                logger.warning("Failed to check screen bounds: {}", e)
 
-            # Perform click with pyautogui
+            # Perform click: one SendInput call, pyautogui as fallback
             try:
-                import pyautogui
-
-                # Move mouse to target (with animation for natural feel)
-                pyautogui.moveTo(click_x, click_y, duration=0.2)
-
-                # Perform click
-                pyautogui.click(click_x, click_y)
+                try:
+                    _wininput.click_at(click_x, click_y)
+                except OSError as e:
+                    logger.warning("SendInput failed, falling back to pyautogui: {}", e)
+                    _lazy("pyautogui").click(click_x, click_y)
 
                 # Voice feedback
                 ui.message(
-                    _("Activated: {text}").format(
+                    _TPL_ACTIVATED.format(
                         text=element.text or element.element_type
                     )
                 )
 
-                # Log success
+                # Log success (loguru formats the arguments only if INFO is enabled)
                 logger.info(
-                    f"Element activated: type={element.element_type}, "
-                    f"text='{element.text}', pos=({click_x}, {click_y}), "
-                    f"confidence={element.confidence:.2%}"
+                    "Element activated: type={}, text={!r}, pos=({}, {}), "
+                    "confidence={:.2%}",
+                    element.element_type, element.text, click_x, click_y,
+                    element.confidence
                 )
 
             except ImportError:
-                ui.message(_("pyautogui not installed"))
+                ui.message(_MSG_NO_PYAUTOGUI)
                 logger.error("pyautogui not available for element activation")
 
             except Exception as e:
-                ui.message(_("Activation failed"))
-                logger.exception(f"Failed to activate element: {e}")
+                ui.message(_MSG_ACTIVATION_FAILED)
+                logger.exception("Failed to activate element: {}", e)
 
         except Exception as e:
             logger.exception("Error in element activation")
-            ui.message(_("Activation error"))
+            ui.message(_MSG_ACTIVATION_ERROR)
+
+    def _get_screen_bounds(self):
+        """Get (width, height) of the primary screen.
+
+        Cached until the display changes; queried every time if the
+        display change handler could not be registered.
+
+        Returns:
+            Tuple of (screen_width, screen_height) in pixels
+        """
+        if self._screen_bounds is None:
+            get_system_metrics = _lazy("win32api").GetSystemMetrics
+            bounds = (get_system_metrics(0), get_system_metrics(1))
+            if not self._display_change_bound:
+                return bounds
+            self._screen_bounds = bounds
+
+        return self._screen_bounds
+
+    def _on_display_changed(self, event):
+        """Drop cached screen size on WM_DISPLAYCHANGE."""
+        self._screen_bounds = None
+        logger.info("Display changed, screen bounds will be refreshed")
+        event.Skip()
 
     def _on_recognition_complete(self, result: RecognitionResult):
         """Callback when recognition completes successfully.
@@ -494,7 +688,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             self.is_recognizing = False
 
             num_elements = result.element_count
-            logger.info(f"Recognition complete: {num_elements} elements found")
+            logger.info("Recognition complete: {} elements found", num_elements)
+
+            # Pre-render speech text once so navigation gestures only speak
+            for element in result.elements:
+                element._speech_cache = self._build_speech_text(element)
 
             if num_elements == 0:
                 ui.message("No UI elements detected")
@@ -518,7 +716,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         """
         try:
             self.is_recognizing = False
-            logger.error(f"Recognition error: {error}")
+            logger.error("Recognition error: {}", error)
             ui.message("Recognition failed. Check logs for details.")
 
         except Exception as e:
@@ -531,38 +729,50 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             element: UIElement instance to announce
         """
         try:
-            # Import speech here to avoid issues if NVDA not available
-            import speech
+            # Resolve speech lazily to avoid issues if NVDA not available
+            speak = _lazy("speech").speak
 
-            # Build speech text
-            text_parts = []
+            # Text is normally pre-rendered in _on_recognition_complete
+            speech_text = getattr(element, "_speech_cache", None)
+            if speech_text is None:
+                speech_text = self._build_speech_text(element)
+                element._speech_cache = speech_text
 
-            # Type and text with better handling for empty text (icon button fix)
-            element_description = element.text if element.text else "unrecognized element"
+            speak(speech_text)
 
-            # If it's a button type without text, add helpful context
-            if not element.text and element.element_type in ["button", "icon_button"]:
-                element_description = f"unrecognized {element.element_type}"
+        except Exception as e:
+            logger.exception("Error speaking element")
+            ui.message(f"{element.element_type}: {element.text}")
 
-            text_parts.append(f"{element.element_type}: {element_description}")
+    @staticmethod
+    def _build_speech_text(element) -> str:
+        """Build the text announced for a UI element.
 
-            # Confidence annotation (real.md constraint 3)
-            from .constants import LOW_CONFIDENCE_THRESHOLD
-            if element.confidence < LOW_CONFIDENCE_THRESHOLD:
-                text_parts.append("(uncertain)")
+        Args:
+            element: UIElement instance to describe
 
-            # Position info
-            x = element.center_x
-            y = element.center_y
-            text_parts.append(f"at {x}, {y}")
+        Returns:
+            Speech text with type, text, uncertainty and position
+        """
+        text_parts = []
 
-            speech_text = " ".join(text_parts)
-            speech.speak(speech_text)
+        # Type and text with better handling for empty text (icon button fix)
+        element_description = element.text if element.text else "unrecognized element"
 
-        except Exception as e:
-            logger.exception("Error speaking element")
-            ui.message(f"{element.element_type}: {element.text}")
+        # If it's a button type without text, add helpful context
+        if not element.text and element.element_type in ["button", "icon_button"]:
+            element_description = f"unrecognized {element.element_type}"
+
+        text_parts.append(f"{element.element_type}: {element_description}")
+
+        # Confidence annotation (real.md constraint 3)
+        if element.confidence < LOW_CONFIDENCE_THRESHOLD:
+            text_parts.append("(uncertain)")
+
+        # Position info
+        text_parts.append(f"at {element.center_x}, {element.center_y}")
 
+        return " ".join(text_parts)
 
 # Module metadata
 __all__ = ["GlobalPlugin"]
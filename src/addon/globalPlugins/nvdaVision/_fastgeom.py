@@ -0,0 +1,42 @@
+"""Batch geometry helpers for recognized UI elements.
+
+Element centers and screen-bounds validity are computed once per
+recognition result instead of on every navigation/activation gesture.
+"""
+
+from typing import List, Sequence, Tuple
+
+
+def validate_and_center(
+    bboxes: Sequence[Sequence[int]],
+    screen_width: int,
+    screen_height: int
+) -> Tuple[List[Tuple[int, int]], List[bool]]:
+    """Compute click centers and on-screen validity for many bboxes.
+
+    Args:
+        bboxes: Bounding boxes as [x1, y1, x2, y2]
+        screen_width: Screen width in pixels
+        screen_height: Screen height in pixels
+
+    Returns:
+        (centers, valid): centers[i] is (cx, cy) of bboxes[i], valid[i] is
+        True if the bbox is well-formed and lies within the screen
+    """
+    centers = []
+    valid = []
+
+    for bbox in bboxes:
+        if not bbox or len(bbox) != 4:
+            centers.append((0, 0))
+            valid.append(False)
+            continue
+
+        x1, y1, x2, y2 = bbox
+        centers.append(((x1 + x2) >> 1, (y1 + y2) >> 1))
+        valid.append(0 <= x1 < x2 <= screen_width and 0 <= y1 < y2 <= screen_height)
+
+    return centers, valid
+
+
+__all__ = ["validate_and_center"]
@@ -0,0 +1,102 @@
+"""Mouse input via the Win32 SendInput API.
+
+A click is sent as one SendInput call with three events (absolute move,
+left down, left up) instead of pyautogui's animated move and click.
+"""
+
+import ctypes
+from ctypes import wintypes
+
+INPUT_MOUSE = 0
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_ABSOLUTE = 0x8000
+
+SM_CXSCREEN = 0
+SM_CYSCREEN = 1
+
+# Absolute mouse coordinates are normalized to 0..65535
+_ABSOLUTE_RANGE = 65535
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),  # ULONG_PTR
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member, so it fixes the union size
+    _fields_ = [("mi", MOUSEINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("union", _INPUTUNION),
+    ]
+
+
+_user32 = None
+
+
+def _get_user32():
+    """Load user32.dll once.
+
+    Raises:
+        OSError: If not running on Windows
+    """
+    global _user32
+    if _user32 is None:
+        try:
+            _user32 = ctypes.WinDLL("user32", use_last_error=True)
+        except AttributeError as e:
+            raise OSError("SendInput is only available on Windows") from e
+    return _user32
+
+
+def _mouse_input(flags: int, dx: int = 0, dy: int = 0) -> INPUT:
+    """Build one mouse INPUT event."""
+    event = INPUT(type=INPUT_MOUSE)
+    event.union.mi = MOUSEINPUT(dx=dx, dy=dy, dwFlags=flags)
+    return event
+
+
+def click_at(x: int, y: int) -> None:
+    """Move the mouse to (x, y) and left-click, in one SendInput call.
+
+    Args:
+        x: Screen X coordinate in pixels
+        y: Screen Y coordinate in pixels
+
+    Raises:
+        OSError: If SendInput is unavailable or rejects the events
+    """
+    user32 = _get_user32()
+
+    screen_width = user32.GetSystemMetrics(SM_CXSCREEN)
+    screen_height = user32.GetSystemMetrics(SM_CYSCREEN)
+    if screen_width <= 1 or screen_height <= 1:
+        raise OSError("Could not determine screen size")
+
+    dx = x * _ABSOLUTE_RANGE // (screen_width - 1)
+    dy = y * _ABSOLUTE_RANGE // (screen_height - 1)
+
+    events = (INPUT * 3)(
+        _mouse_input(MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE, dx, dy),
+        _mouse_input(MOUSEEVENTF_LEFTDOWN),
+        _mouse_input(MOUSEEVENTF_LEFTUP),
+    )
+
+    sent = user32.SendInput(len(events), events, ctypes.sizeof(INPUT))
+    if sent != len(events):
+        raise OSError(ctypes.get_last_error(), "SendInput failed")
+
+
+__all__ = ["click_at"]
@@ -4,8 +4,10 @@ This module defines all constants, enums, and default values used throughout
 the NVDA Vision Screen Reader plugin.
 """
 
-from enum import Enum, auto
+from enum import Enum, IntEnum
 from pathlib import Path
+from types import MappingProxyType
+from typing import Final, FrozenSet, Mapping
 
 # Version
 __version__ = "0.1.0"
@@ -13,28 +15,37 @@ __version__ = "0.1.0"
 # ========== Timing Constants ==========
 
 # Maximum model inference time (real.md constraint 6)
-MAX_INFERENCE_TIME = 15.0  # seconds
+MAX_INFERENCE_TIME: Final[float] = 15.0  # seconds
 
 # Progress feedback delay (real.md constraint 6)
-PROGRESS_FEEDBACK_DELAY = 5.0  # seconds
+PROGRESS_FEEDBACK_DELAY: Final[float] = 5.0  # seconds
 
 # Progress update interval
-PROGRESS_UPDATE_INTERVAL = 3.0  # seconds
+PROGRESS_UPDATE_INTERVAL: Final[float] = 3.0  # seconds
 
 # Cache TTL
-CACHE_TTL = 300  # seconds (5 minutes)
+CACHE_TTL: Final[int] = 300  # seconds (5 minutes)
 
 # Cleanup interval
-CLEANUP_INTERVAL = 3600  # seconds (1 hour)
+CLEANUP_INTERVAL: Final[int] = 3600  # seconds (1 hour)
 
 
 # ========== Recognition Constants ==========
 
 # Minimum confidence threshold (real.md constraint 3)
-MIN_CONFIDENCE_THRESHOLD = 0.7
+MIN_CONFIDENCE_THRESHOLD: Final[float] = 0.7
 
 # Low confidence threshold for "uncertain" annotation
-LOW_CONFIDENCE_THRESHOLD = 0.7
+LOW_CONFIDENCE_THRESHOLD: Final[float] = 0.7
+
+# Screenshots whose dHashes differ in fewer bits are treated as the same screen
+SIMILAR_SCREENSHOT_MAX_DISTANCE: Final[int] = 5
+
+# Number of recent results kept for near-duplicate screenshot reuse
+RECENT_RESULTS_SIZE: Final[int] = 8
+
+# Number of results kept in memory by exact screenshot hash, ahead of SQLite
+HOT_CACHE_SIZE: Final[int] = 64
 
 
 # ========== Model Constants ==========
@@ -49,11 +60,11 @@ UITARS_MIN_VRAM = 16.0  # GPU VRAM
 MINICPM_MIN_RAM = 6.0   # System RAM
 
 # Inference timeouts per model
-MODEL_TIMEOUTS = {
+MODEL_TIMEOUTS: Final[Mapping[str, float]] = MappingProxyType({
     MODEL_UITARS_7B: 15.0,
     MODEL_MINICPM_V_26: 20.0,
     MODEL_DOUBAO_API: 10.0,
-}
+})
 
 
 # ========== Path Constants ==========
@@ -88,41 +99,50 @@ GESTURE_CANCEL = "kb:escape"
 # ========== UI Element Types ==========
 
 # Interactive element types
-INTERACTIVE_TYPES = {"button", "link", "textbox", "dropdown", "checkbox", "radio"}
+INTERACTIVE_TYPES: Final[FrozenSet[str]] = frozenset(
+    {"button", "link", "textbox", "dropdown", "checkbox", "radio"}
+)
 
 # Display element types
-DISPLAY_TYPES = {"text", "icon", "image", "label", "tooltip"}
+DISPLAY_TYPES: Final[FrozenSet[str]] = frozenset(
+    {"text", "icon", "image", "label", "tooltip"}
+)
 
 # Container element types
-CONTAINER_TYPES = {"dialog", "panel", "menu", "list", "table"}
+CONTAINER_TYPES: Final[FrozenSet[str]] = frozenset(
+    {"dialog", "panel", "menu", "list", "table"}
+)
 
 
 # ========== Enums ==========
 
-class ModelStatus(Enum):
+# Integer-valued so comparisons are plain int compares; values match the
+# previous auto() numbering
+
+class ModelStatus(IntEnum):
     """Model loading/inference status."""
-    NOT_LOADED = auto()
-    LOADING = auto()
-    LOADED = auto()
-    LOAD_FAILED = auto()
-    DEGRADED = auto()
+    NOT_LOADED = 1
+    LOADING = 2
+    LOADED = 3
+    LOAD_FAILED = 4
+    DEGRADED = 5
 
 
-class RecognitionStatus(Enum):
+class RecognitionStatus(IntEnum):
     """Recognition result status."""
-    SUCCESS = auto()
-    PARTIAL_SUCCESS = auto()  # Low confidence
-    FAILURE = auto()
-    TIMEOUT = auto()
-    CACHE_HIT = auto()
+    SUCCESS = 1
+    PARTIAL_SUCCESS = 2  # Low confidence
+    FAILURE = 3
+    TIMEOUT = 4
+    CACHE_HIT = 5
 
 
-class InferenceSource(Enum):
+class InferenceSource(IntEnum):
     """Source of inference result."""
-    LOCAL_GPU = auto()
-    LOCAL_CPU = auto()
-    CLOUD_API = auto()
-    CACHE = auto()
+    LOCAL_GPU = 1
+    LOCAL_CPU = 2
+    CLOUD_API = 3
+    CACHE = 4
 
 
 class ElementType(Enum):
@@ -166,7 +186,9 @@ MAX_SCREENSHOT_DIMENSION = 1920  # pixels
 SCREENSHOT_QUALITY = 85  # 1-100
 
 # Supported image formats
-SUPPORTED_IMAGE_FORMATS = {".png", ".jpg", ".jpeg", ".bmp"}
+SUPPORTED_IMAGE_FORMATS: Final[FrozenSet[str]] = frozenset(
+    {".png", ".jpg", ".jpeg", ".bmp"}
+)
 
 
 # ========== API Constants ==========
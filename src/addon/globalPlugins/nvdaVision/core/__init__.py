@@ -1,7 +1,9 @@
 """Core business logic components."""
 
 from .recognition_controller import RecognitionController
+from .prefetcher import RecognitionPrefetcher
 
 __all__ = [
     "RecognitionController",
+    "RecognitionPrefetcher",
 ]
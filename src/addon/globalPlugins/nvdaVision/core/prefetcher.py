@@ -0,0 +1,175 @@
+"""Background recognition prefetching.
+
+This module keeps a small queue of recognition results for the current
+screen so that a recognize gesture can be answered immediately instead of
+waiting for model inference.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from ..schemas.recognition_result import RecognitionResult
+from ..services.screenshot_service import ScreenshotService
+from ..infrastructure.logger import logger
+from ..utils.image_hash import hamming_distance
+from ..constants import SIMILAR_SCREENSHOT_MAX_DISTANCE
+from .recognition_controller import RecognitionController
+
+
+class RecognitionPrefetcher:
+    """Prefetch recognition results on a background thread.
+
+    The thread polls the active window. When the screen changes, results
+    for the previous screen are discarded. When the queue is below the
+    low-water mark and the screen is not a near-duplicate of the last
+    submitted one, a new recognition is run and its result queued.
+    """
+
+    def __init__(
+        self,
+        controller: RecognitionController,
+        screenshot_service: ScreenshotService,
+        capacity: int = 4,
+        low_water: float = 0.5,
+        poll_interval: float = 2.0,
+        max_distance: int = SIMILAR_SCREENSHOT_MAX_DISTANCE
+    ):
+        """Initialize prefetcher.
+
+        Args:
+            controller: Recognition controller running the pipeline
+            screenshot_service: Service for capturing screenshots
+            capacity: Maximum number of queued results
+            low_water: Prefetch while len(queue) / capacity is below this
+            poll_interval: Seconds between screen polls
+            max_distance: dHash Hamming distance below which two
+                screenshots are considered the same screen
+        """
+        self.controller = controller
+        self.screenshot_service = screenshot_service
+        self.capacity = capacity
+        self.low_water = low_water
+        self.poll_interval = poll_interval
+        self.max_distance = max_distance
+
+        # ((width, height), dhash, result) entries, newest on the right
+        self._results: Deque[Tuple[Tuple[int, int], int, RecognitionResult]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._screen_hash: Optional[int] = None
+        self._submitted_hash: Optional[int] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the prefetch thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name="RecognitionPrefetcher"
+        )
+        self._thread.start()
+        logger.info("Recognition prefetcher started")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the prefetch thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logger.info("Recognition prefetcher stopped")
+
+    def take(self) -> Optional[RecognitionResult]:
+        """Pop the freshest result for the current screen.
+
+        The screen is captured again here: the last poll can be up to
+        poll_interval old, and a result for a screen that has since
+        changed would be spoken and clicked at the wrong place.
+
+        Returns:
+            Prefetched RecognitionResult, or None if none matches the
+            screen as it is now
+        """
+        with self._lock:
+            if not self._results:
+                return None
+
+        try:
+            screenshot = self.screenshot_service.capture_active_window()
+        except Exception:
+            logger.exception("Failed to capture screen for prefetched result")
+            return None
+
+        size = (screenshot.width, screenshot.height)
+        screen_hash = screenshot.perceptual_hash
+
+        with self._lock:
+            while self._results:
+                result_size, result_hash, result = self._results.pop()
+                if result_size == size and self._is_same_screen(result_hash, screen_hash):
+                    return result
+            return None
+
+    def _needs_processing(self) -> bool:
+        """Check whether the queue is below the low-water mark."""
+        with self._lock:
+            return len(self._results) / self.capacity < self.low_water
+
+    def _is_same_screen(self, a: Optional[int], b: Optional[int]) -> bool:
+        """Check whether two dHashes describe the same screen."""
+        if a is None or b is None:
+            return False
+        return hamming_distance(a, b) < self.max_distance
+
+    def _run(self):
+        """Prefetch loop running in background thread."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self._poll()
+            except Exception:
+                logger.exception("Prefetch iteration failed")
+
+    def _poll(self):
+        """Capture the screen once and prefetch if needed."""
+        screenshot = self.screenshot_service.capture_active_window()
+        screen_hash = screenshot.perceptual_hash
+
+        with self._lock:
+            if not self._is_same_screen(screen_hash, self._screen_hash):
+                # Screen changed: queued results no longer apply
+                self._results.clear()
+            self._screen_hash = screen_hash
+
+        if not self._needs_processing():
+            return
+
+        if self._is_same_screen(screen_hash, self._submitted_hash):
+            # Near-duplicate of the last submitted screenshot
+            return
+
+        self._submitted_hash = screen_hash
+        result = self.controller.recognize_screenshot(screenshot)
+
+        if self._stop_event.is_set():
+            return
+
+        with self._lock:
+            self._results.append(
+                ((screenshot.width, screenshot.height), screen_hash, result)
+            )
+
+        logger.debug(
+            f"Prefetched {result.element_count} elements for "
+            f"{screenshot.hash[:8]}"
+        )
+
+
+__all__ = ["RecognitionPrefetcher"]
@@ -4,8 +4,12 @@ This module coordinates the complete recognition pipeline:
 screenshot → cache lookup → inference → result processing → speech output
 """
 
+import queue
 import threading
-from typing import Callable, Optional, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, List, Tuple
 from datetime import datetime
 import time
 
@@ -16,7 +20,44 @@ from ..services.cache_manager import CacheManager
 from ..services.vision_engine import VisionEngine
 from ..services.result_processor import ResultProcessor
 from ..infrastructure.logger import logger
-from ..constants import RecognitionStatus, InferenceSource
+from ..constants import (
+    RecognitionStatus, InferenceSource,
+    SIMILAR_SCREENSHOT_MAX_DISTANCE, RECENT_RESULTS_SIZE,
+    HOT_CACHE_SIZE
+)
+from ..utils.image_hash import hamming_distance
+from .._fastgeom import validate_and_center
+
+try:
+    import wx
+    import ui
+    _CALL_AFTER = wx.CallAfter
+    _UI_MESSAGE = ui.message
+except ImportError:
+    # Outside NVDA (tests, tooling): callbacks run directly, no speech
+    _CALL_AFTER = None
+    _UI_MESSAGE = None
+
+
+def _call_directly(func: Callable, arg):
+    """Run callback on the calling thread (no wx available)."""
+    func(arg)
+
+# Sentinel that stops the pipeline stage threads
+_STOP = object()
+
+
+@dataclass
+class _RecognitionRequest:
+    """One recognize-screen request travelling through the pipeline."""
+
+    request_id: int
+    callback: Callable
+    error_callback: Callable
+    start_time: float
+    screenshot: Optional[Screenshot] = None
+    result: Optional[RecognitionResult] = None
+    error: Optional[Exception] = None
 
 
 class RecognitionController:
@@ -53,12 +94,49 @@ class RecognitionController:
         self.result_processor = result_processor
         self.config = config
 
-        # Current state
-        self._current_thread: Optional[threading.Thread] = None
-        self._cancel_requested = False
+        # Current state; only the request with the latest id is delivered
+        self._request_id = 0
         self._current_result: Optional[RecognitionResult] = None
         self._current_element_index = 0
 
+        # Recent results keyed by (width, height, perceptual hash), oldest
+        # first; bboxes only carry over between screenshots of equal size
+        self._recent_results: "OrderedDict[Tuple[int, int, int], RecognitionResult]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+
+        # Recent results keyed by SHA-256 screenshot hash, oldest first;
+        # checked before the SQLite cache
+        self._hot_cache: "OrderedDict[str, RecognitionResult]" = OrderedDict()
+        self._hot_lock = threading.Lock()
+
+        # Bbox column of the current result, built once per result
+        self._bboxes: List[Tuple[int, int, int, int]] = []
+
+        # Per-result geometry table: (screen size, centers, valid flags)
+        self._geometry = None
+
+        # Single-slot stage queues: capture -> inference -> delivery.
+        # Capture of the next request overlaps inference of the previous.
+        # The result queue is unbounded: both earlier stages feed it, and a
+        # late stale result must not evict the current request's result
+        # (delivery drops stale items itself)
+        self._capture_q: "queue.Queue" = queue.Queue(maxsize=1)
+        self._infer_q: "queue.Queue" = queue.Queue(maxsize=1)
+        self._result_q: "queue.Queue" = queue.Queue()
+        self._stage_threads: List[threading.Thread] = []
+
+        # Callback dispatcher, picked once from wx availability; callbacks
+        # always come from the delivery thread, so wx always queues them
+        self._dispatch = _call_directly if _CALL_AFTER is None else _CALL_AFTER
+
+        self._start_pipeline()
+
+        # Reused for progress monitors instead of a new thread per inference
+        self._executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="Recog"
+        )
+
         logger.info("RecognitionController initialized with full pipeline")
 
     def recognize_screen_async(
@@ -66,155 +144,384 @@ class RecognitionController:
         callback: Callable[[RecognitionResult], None],
         error_callback: Callable[[Exception], None]
     ):
-        """Recognize screen in background thread.
+        """Recognize screen in the background pipeline.
+
+        A new request supersedes any request still in flight; the older
+        one is dropped at its next stage boundary.
 
         Args:
             callback: Called with result on success
             error_callback: Called with exception on failure
         """
-        # Cancel previous recognition if still running
-        if self._current_thread and self._current_thread.is_alive():
-            logger.warning("Previous recognition still running, cancelling")
-            self._cancel_requested = True
-            self._current_thread.join(timeout=1.0)
-
-        self._cancel_requested = False
-
-        # Start new background thread
-        self._current_thread = threading.Thread(
-            target=self._recognition_worker,
-            args=(callback, error_callback),
-            daemon=True,
-            name="RecognitionWorker"
+        self._request_id += 1
+        request = _RecognitionRequest(
+            request_id=self._request_id,
+            callback=callback,
+            error_callback=error_callback,
+            start_time=time.time()
         )
-        self._current_thread.start()
+        self._put_latest(self._capture_q, request)
 
-        logger.info("Recognition started in background thread")
-
-    def _recognition_worker(
-        self,
-        callback: Callable,
-        error_callback: Callable
-    ):
-        """Worker function running in background thread."""
-        start_time = time.time()
-        progress_notified = False
+        logger.info("Recognition queued in background pipeline")
 
-        try:
-            # Step 1: Capture screenshot
-            logger.debug("Step 1: Capturing screenshot...")
-            screenshot = self.screenshot_service.capture_active_window()
-
-            if self._cancel_requested:
-                logger.info("Recognition cancelled after screenshot")
+    def _start_pipeline(self):
+        """Start the long-lived capture, inference and delivery threads."""
+        stages = (
+            (self._capture_stage, "RecognitionCapture"),
+            (self._inference_stage, "RecognitionInference"),
+            (self._delivery_stage, "RecognitionDelivery"),
+        )
+        for target, name in stages:
+            thread = threading.Thread(target=target, daemon=True, name=name)
+            thread.start()
+            self._stage_threads.append(thread)
+
+    @staticmethod
+    def _put_latest(stage_queue: "queue.Queue", item):
+        """Put item on a single-slot stage queue, dropping a stale item."""
+        while True:
+            try:
+                stage_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    stage_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _is_stale(self, request: "_RecognitionRequest") -> bool:
+        """Check whether a newer request or a cancellation superseded this one."""
+        return request.request_id != self._request_id
+
+    def _capture_stage(self):
+        """Step 1-2: capture screenshot and look up existing results."""
+        while True:
+            request = self._capture_q.get()
+            if request is _STOP:
+                self._put_latest(self._infer_q, _STOP)
                 return
 
-            # Step 2: Check cache
-            logger.debug(f"Step 2: Checking cache for {screenshot.hash[:8]}")
-            cached_result = self.cache_manager.get(screenshot)
+            if self._is_stale(request):
+                continue
 
-            if cached_result:
-                # Cache hit
-                logger.info(f"Cache hit: {screenshot.hash[:8]}")
-                self._current_result = cached_result
-                self._current_element_index = 0
-                self._call_on_main_thread(callback, cached_result)
+            try:
+                # Step 1: Capture screenshot
+                logger.debug("Step 1: Capturing screenshot...")
+                screenshot = self.screenshot_service.capture_active_window()
+
+                if self._is_stale(request):
+                    logger.info("Recognition cancelled after screenshot")
+                    continue
+
+                request.screenshot = screenshot
+
+                # Step 2a: Reuse result of a visually identical recent screenshot
+                similar_result = self._find_similar_result(screenshot)
+                if similar_result:
+                    logger.info(f"Near-duplicate screenshot: {screenshot.hash[:8]}")
+                    request.result = similar_result
+                    self._result_q.put(request)
+                    continue
+
+                # Step 2: Check cache
+                logger.debug(f"Step 2: Checking cache for {screenshot.hash[:8]}")
+                cached_result = self._get_cached(screenshot)
+
+                if cached_result:
+                    # Cache hit
+                    logger.info(f"Cache hit: {screenshot.hash[:8]}")
+                    request.result = cached_result
+                    self._result_q.put(request)
+                    continue
+
+            except Exception as e:
+                elapsed = time.time() - request.start_time
+                logger.exception(f"Recognition failed after {elapsed:.2f}s")
+                request.error = e
+                self._result_q.put(request)
+                continue
+
+            # Step 3: Cache miss - hand over to inference
+            logger.info("Cache miss - performing inference")
+            self._put_latest(self._infer_q, request)
+
+    def _inference_stage(self):
+        """Step 3-5: run inference, process and cache the result."""
+        while True:
+            request = self._infer_q.get()
+            if request is _STOP:
+                self._result_q.put(_STOP)
                 return
 
-            # Step 3: Cache miss - perform inference
-            logger.info("Cache miss - performing inference")
+            if self._is_stale(request):
+                logger.info("Recognition cancelled before inference")
+                continue
 
             # Set up progress feedback (after 5 seconds) - real.md constraint 6
-            def progress_monitor():
-                nonlocal progress_notified
-                time.sleep(5.0)
-                if not progress_notified and self._current_thread and self._current_thread.is_alive():
-                    elapsed = time.time() - start_time
-                    logger.info(f"Long-running inference, {elapsed:.1f}s elapsed")
-
-                    # Notify user via voice feedback
-                    try:
-                        import wx
-                        import ui
-                        wx.CallAfter(
-                            ui.message,
-                            f"Recognizing, {int(elapsed)} seconds elapsed..."
-                        )
-                        progress_notified = True
-                    except Exception as e:
-                        logger.warning(f"Failed to provide progress feedback: {e}")
-
-            progress_thread = threading.Thread(target=progress_monitor, daemon=True)
-            progress_thread.start()
-
-            if self._cancel_requested:
-                logger.info("Recognition cancelled before inference")
+            progress_done = threading.Event()
+            self._executor.submit(self._progress_monitor, request, progress_done)
+
+            try:
+                request.result = self._infer_and_process(request.screenshot)
+            except Exception as e:
+                elapsed = time.time() - request.start_time
+                logger.exception(f"Recognition failed after {elapsed:.2f}s")
+                request.error = e
+            finally:
+                progress_done.set()
+
+            if self._is_stale(request):
+                logger.info("Recognition cancelled during inference")
+                continue
+
+            self._result_q.put(request)
+
+    def _delivery_stage(self):
+        """Update navigation state and call back on the main thread."""
+        while True:
+            request = self._result_q.get()
+            if request is _STOP:
                 return
 
-            # Run inference with fallback
-            timeout = self.config.get("inference_timeout", 15.0)
-            inference_start = time.time()
+            if self._is_stale(request):
+                logger.info("Recognition cancelled after inference")
+                continue
+
+            try:
+                self._deliver(request)
+            except Exception:
+                logger.exception("Failed to deliver recognition result")
+
+    def _deliver(self, request: "_RecognitionRequest"):
+        """Deliver one finished request to its callbacks."""
+        if request.error is not None:
+            self._call_on_main_thread(request.error_callback, request.error)
+            return
+
+        # Update state
+        result = request.result
+        self.set_current_result(result)
+
+        elapsed = time.time() - request.start_time
+        logger.info(
+            f"Recognition complete: {len(result.elements)} elements "
+            f"in {elapsed:.2f}s total"
+        )
+
+        # Callback with result
+        self._call_on_main_thread(request.callback, result)
 
-            elements, source = self.vision_engine.infer_with_fallback(
-                screenshot,
-                timeout=timeout
+    def _progress_monitor(
+        self,
+        request: "_RecognitionRequest",
+        progress_done: threading.Event
+    ):
+        """Announce long-running inference unless it finishes within 5s."""
+        if progress_done.wait(5.0):
+            return
+        if self._is_stale(request):
+            return
+
+        elapsed = time.time() - request.start_time
+        logger.info(f"Long-running inference, {elapsed:.1f}s elapsed")
+
+        # Notify user via voice feedback
+        if _CALL_AFTER is None:
+            return
+        try:
+            _CALL_AFTER(
+                _UI_MESSAGE,
+                f"Recognizing, {int(elapsed)} seconds elapsed..."
             )
+        except Exception as e:
+            logger.warning(f"Failed to provide progress feedback: {e}")
 
-            inference_time = time.time() - inference_start
+    def recognize_screenshot(self, screenshot: Screenshot) -> RecognitionResult:
+        """Run the recognition pipeline synchronously for a screenshot.
 
-            if self._cancel_requested:
-                logger.info("Recognition cancelled after inference")
-                return
+        Used by the prefetch thread. Does not change navigation state;
+        call set_current_result() when the result is presented.
 
-            # Step 4: Process results
-            logger.debug(f"Step 4: Processing {len(elements)} elements")
+        Args:
+            screenshot: Already captured screenshot
 
-            result = self.result_processor.process(
-                elements=elements,
-                screenshot=screenshot,
-                model_name=self.vision_engine.primary_adapter.name,
-                inference_time=inference_time,
-                source=source
-            )
+        Returns:
+            Cached or freshly inferred RecognitionResult
+        """
+        similar_result = self._find_similar_result(screenshot)
+        if similar_result:
+            return similar_result
 
-            # Step 5: Cache result (if successful)
-            if result.status != RecognitionStatus.FAILURE:
-                logger.debug("Step 5: Caching result")
-                self.cache_manager.put(screenshot, result)
+        cached_result = self._get_cached(screenshot)
+        if cached_result:
+            return cached_result
 
-            # Update state
-            self._current_result = result
-            self._current_element_index = 0
+        return self._infer_and_process(screenshot)
+
+    def set_current_result(self, result: RecognitionResult):
+        """Make result the one used for element navigation.
+
+        Args:
+            result: Recognition result to navigate
+        """
+        self._current_result = result
+        self._current_element_index = 0
+        self._bboxes = [tuple(e.bbox) for e in result.elements] if result else []
+        self._geometry = None
+
+    def get_current_geometry(
+        self,
+        screen_width: int,
+        screen_height: int
+    ) -> Optional[Tuple[int, int, bool]]:
+        """Get click center and on-screen validity of the current element.
 
-            elapsed = time.time() - start_time
-            logger.info(
-                f"Recognition complete: {len(result.elements)} elements "
-                f"in {elapsed:.2f}s total"
+        Centers and validity for all elements are computed in one pass the
+        first time they are needed for a result and screen size.
+
+        Args:
+            screen_width: Screen width in pixels
+            screen_height: Screen height in pixels
+
+        Returns:
+            (center_x, center_y, valid) or None if no current element
+        """
+        if self.get_current_element() is None:
+            return None
+
+        screen_size = (screen_width, screen_height)
+        if self._geometry is None or self._geometry[0] != screen_size:
+            centers, valid = validate_and_center(
+                self._bboxes,
+                screen_width,
+                screen_height
             )
+            self._geometry = (screen_size, centers, valid)
 
-            # Callback with result
-            self._call_on_main_thread(callback, result)
+        _, centers, valid = self._geometry
+        cx, cy = centers[self._current_element_index]
+        return cx, cy, valid[self._current_element_index]
 
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.exception(f"Recognition failed after {elapsed:.2f}s")
-            self._call_on_main_thread(error_callback, e)
+    def _infer_and_process(self, screenshot: Screenshot) -> RecognitionResult:
+        """Run inference, post-process and cache the result.
+
+        Args:
+            screenshot: Screenshot to recognize
+
+        Returns:
+            Processed RecognitionResult
+        """
+        # Run inference with fallback
+        timeout = self.config.get("inference_timeout", 15.0)
+
+        inference_start = time.time()
+
+        elements, source = self.vision_engine.infer_with_fallback(
+            screenshot,
+            timeout=timeout
+        )
+
+        inference_time = time.time() - inference_start
+
+        # Step 4: Process results
+        logger.debug(f"Step 4: Processing {len(elements)} elements")
+
+        result = self.result_processor.process(
+            elements=elements,
+            screenshot=screenshot,
+            model_name=self.vision_engine.primary_adapter.name,
+            inference_time=inference_time,
+            source=source
+        )
+
+        # Step 5: Cache result (if successful)
+        if result.status != RecognitionStatus.FAILURE:
+            logger.debug("Step 5: Caching result")
+            self.cache_manager.put(screenshot, result)
+            self._remember_result(screenshot, result)
+
+        return result
+
+    def _find_similar_result(self, screenshot: Screenshot) -> Optional[RecognitionResult]:
+        """Find a recent result for a visually near-identical screenshot.
+
+        Args:
+            screenshot: Newly captured screenshot
+
+        Returns:
+            Unexpired RecognitionResult for a screenshot of the same size,
+            or None
+        """
+        if screenshot.perceptual_hash is None:
+            return None
+
+        width, height = screenshot.width, screenshot.height
+        with self._recent_lock:
+            for key, result in reversed(self._recent_results.items()):
+                if key[0] != width or key[1] != height:
+                    continue
+                if hamming_distance(key[2], screenshot.perceptual_hash) \
+                        < SIMILAR_SCREENSHOT_MAX_DISTANCE:
+                    if result.is_expired:
+                        continue
+                    self._recent_results.move_to_end(key)
+                    return result
+
+        return None
+
+    def _get_cached(self, screenshot: Screenshot) -> Optional[RecognitionResult]:
+        """Look up a result by exact hash, in memory first, then SQLite.
+
+        Args:
+            screenshot: Newly captured screenshot
+
+        Returns:
+            Unexpired RecognitionResult or None
+        """
+        with self._hot_lock:
+            result = self._hot_cache.get(screenshot.hash)
+            if result is not None:
+                if not result.is_expired:
+                    self._hot_cache.move_to_end(screenshot.hash)
+                    return result
+                del self._hot_cache[screenshot.hash]
+
+        result = self.cache_manager.get(screenshot)
+        if result:
+            self._remember_result(screenshot, result)
+        return result
+
+    def _remember_result(self, screenshot: Screenshot, result: RecognitionResult):
+        """Keep result for exact and near-duplicate lookups (bounded LRUs)."""
+        with self._hot_lock:
+            self._hot_cache[screenshot.hash] = result
+            self._hot_cache.move_to_end(screenshot.hash)
+            while len(self._hot_cache) > HOT_CACHE_SIZE:
+                self._hot_cache.popitem(last=False)
+
+        if screenshot.perceptual_hash is None:
+            return
+
+        key = (screenshot.width, screenshot.height, screenshot.perceptual_hash)
+        with self._recent_lock:
+            self._recent_results[key] = result
+            self._recent_results.move_to_end(key)
+            while len(self._recent_results) > RECENT_RESULTS_SIZE:
+                self._recent_results.popitem(last=False)
+
+    def clear_memory_cache(self):
+        """Drop in-memory results so cleared cache entries aren't reused."""
+        with self._hot_lock:
+            self._hot_cache.clear()
+        with self._recent_lock:
+            self._recent_results.clear()
 
     def _call_on_main_thread(self, func: Callable, arg):
         """Call function on NVDA main thread.
 
-        Uses wx.CallAfter to safely update UI from background thread.
+        Dispatches through the function chosen at construction time.
         """
-        try:
-            import wx
-            wx.CallAfter(func, arg)
-        except Exception as e:
-            logger.exception("Failed to call function on main thread")
-            # Fallback: call directly (less safe but better than nothing)
-            try:
-                func(arg)
-            except Exception:
-                logger.exception("Callback failed even on direct call")
+        self._dispatch(func, arg)
 
     def get_next_element(self) -> Optional[UIElement]:
         """Navigate to next UI element.
@@ -265,15 +572,17 @@ class RecognitionController:
 
     def cancel_recognition(self):
         """Request cancellation of current recognition."""
-        if self._current_thread and self._current_thread.is_alive():
-            logger.info("Requesting recognition cancellation")
-            self._cancel_requested = True
+        logger.info("Requesting recognition cancellation")
+        self._request_id += 1
 
     def cleanup(self):
         """Cleanup resources."""
         self.cancel_recognition()
-        if self._current_thread:
-            self._current_thread.join(timeout=2.0)
+        self._put_latest(self._capture_q, _STOP)
+        for thread in self._stage_threads:
+            thread.join(timeout=2.0)
+        # Don't block NVDA shutdown on a monitor still waiting out its 5s
+        self._executor.shutdown(wait=False, cancel_futures=True)
         logger.info("RecognitionController cleaned up")
 
 
@@ -1,12 +1,13 @@
 """Infrastructure layer for NVDA Vision plugin."""
 
-from .logger import logger, setup_logger
+from .logger import logger, setup_logger, shutdown_logger
 from .config_loader import ConfigManager
 from .cache_database import CacheDatabase
 
 __all__ = [
     "logger",
     "setup_logger",
+    "shutdown_logger",
     "ConfigManager",
     "CacheDatabase",
 ]
@@ -4,12 +4,151 @@ This module implements the database design from spec/dev/db.spec.md
 """
 
 import sqlite3
+import struct
+import threading
+from collections import deque
 from pathlib import Path
-from datetime import datetime, timedelta
+import time
 from typing import Optional, Dict, Any, List
 import json
 
 from .logger import logger
+from ..utils.image_hash import hamming_distance
+
+try:
+    import orjson
+
+    def _dumps_json(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _loads_json = orjson.loads
+except ImportError:
+    # orjson is optional; NVDA's bundled Python only has the stdlib json
+    _dumps_json = json.dumps
+    _loads_json = json.loads
+
+# Seconds between batched hit_count writes
+HIT_FLUSH_INTERVAL = 1.0
+
+# Perceptual hashes are unsigned 64-bit; SQLite INTEGER is signed
+_PHASH_MASK = (1 << 64) - 1
+_PHASH_SIGN = 1 << 63
+
+# Element bounding boxes are stored as four little-endian uint16 (8 bytes)
+_BBOX_STRUCT = struct.Struct('<HHHH')
+_BBOX_MAX = 0xFFFF
+
+
+def _pack_bbox(bbox) -> bytes:
+    """Pack [x1, y1, x2, y2] into 8 bytes, clamping to the uint16 range."""
+    return _BBOX_STRUCT.pack(*(min(max(int(v), 0), _BBOX_MAX) for v in bbox[:4]))
+
+
+def _phash_to_sqlite(phash: Optional[int]) -> Optional[int]:
+    """Reinterpret an unsigned 64-bit hash as a signed SQLite INTEGER."""
+    if phash is not None and phash & _PHASH_SIGN:
+        return phash - (1 << 64)
+    return phash
+
+# Hot-path statements, kept as constants so sqlite3's statement cache
+# reuses the same prepared statement on every call
+_SQL_LOOKUP = """
+    SELECT id, result_json, hit_count, model_name, inference_time_ms
+    FROM recognition_results
+    WHERE screenshot_id = (
+        SELECT id FROM screenshots WHERE sha256_hash = ?
+    )
+      AND expires_at > ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_SQL_LOOKUP_BY_SCREENSHOT = """
+    SELECT id, result_json, hit_count, model_name, inference_time_ms
+    FROM recognition_results
+    WHERE screenshot_id = ?
+      AND expires_at > ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_SQL_SIMILAR_CANDIDATES = """
+    SELECT id, phash FROM screenshots
+    WHERE width = ? AND height = ?
+      AND phash IS NOT NULL
+      AND expires_at > ?
+"""
+
+_SQL_LOOKUP_META = """
+    SELECT id, hit_count, model_name, inference_time_ms, element_count
+    FROM recognition_results
+    WHERE screenshot_id = (
+        SELECT id FROM screenshots WHERE sha256_hash = ?
+    )
+      AND expires_at > ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_SQL_INSERT_SCREENSHOT = """
+    INSERT OR IGNORE INTO screenshots (
+        sha256_hash, width, height,
+        source_window, captured_at, expires_at, phash
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_SCREENSHOT_ID = "SELECT id FROM screenshots WHERE sha256_hash = ?"
+
+_SQL_INSERT_RESULT = """
+    INSERT INTO recognition_results (
+        screenshot_id, model_name, inference_time_ms,
+        confidence_score, element_count, result_json, status,
+        expires_at, last_accessed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ELEMENT = """
+    INSERT INTO ui_elements (
+        result_id, element_type, text_content,
+        bbox, confidence, actionable
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_RECORD_HITS = """
+    UPDATE recognition_results
+    SET hit_count = hit_count + ?,
+        last_accessed_at = ?
+    WHERE id = ?
+"""
+
+_SQL_DELETE_EXPIRED = "DELETE FROM screenshots WHERE expires_at < ?"
+
+_SQL_COUNT_RESULTS = "SELECT COUNT(*) as cnt FROM recognition_results"
+
+_SQL_EVICT_LRU = """
+    DELETE FROM recognition_results
+    WHERE id IN (
+        SELECT id FROM recognition_results
+        ORDER BY last_accessed_at ASC
+        LIMIT ?
+    )
+"""
+
+_SQL_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM screenshots) as total_screenshots,
+        results.total_results,
+        (SELECT COUNT(*) FROM ui_elements) as total_elements,
+        results.total_hits,
+        results.avg_hits
+    FROM (
+        SELECT
+            COUNT(*) as total_results,
+            SUM(hit_count) as total_hits,
+            AVG(hit_count) as avg_hits
+        FROM recognition_results
+    ) as results
+"""
 
 
 class CacheDatabase:
@@ -27,15 +166,60 @@ class CacheDatabase:
         self.conn = sqlite3.connect(
             str(db_path),
             check_same_thread=False,  # Allow multi-threading
-            isolation_level='DEFERRED'
+            isolation_level='DEFERRED',
+            cached_statements=128
         )
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
 
+        # Serializes write transactions on the shared connection
+        self._write_lock = threading.Lock()
+
+        self._configure_connection()
         self._create_tables()
-        self._cleanup_expired()  # Startup cleanup
+
+        # In-memory result count so inserts skip COUNT(*) below the cap
+        self._cached_row_count = self._count_results()
+
+        # Startup cleanup runs in the background so lookups are served at once
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_expired,
+            daemon=True,
+            name="CacheCleanup"
+        )
+        self._cleanup_thread.start()
+
+        # Cache hits are recorded off the lookup path as (result_id, accessed_at)
+        self._hit_queue = deque()
+        self._stop_event = threading.Event()
+        self._hit_writer = threading.Thread(
+            target=self._hit_writer_loop,
+            daemon=True,
+            name="CacheHitWriter"
+        )
+        self._hit_writer.start()
 
         logger.info(f"Cache database initialized at {db_path}")
 
+    def _configure_connection(self):
+        """Apply performance PRAGMAs (WAL journal, relaxed sync, memory cache).
+
+        Failures (e.g. read-only filesystem) leave SQLite defaults in place.
+        """
+        pragmas = (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-20000",  # 20 MB
+            "PRAGMA mmap_size=268435456",  # 256 MB
+            "PRAGMA wal_autocheckpoint=1000",
+            "PRAGMA foreign_keys=ON",
+        )
+        for pragma in pragmas:
+            try:
+                self.conn.execute(pragma)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to apply {pragma}: {e}")
+
     def _create_tables(self):
         """Create all tables and indexes if not exist."""
         # Create screenshots table
@@ -47,9 +231,10 @@ class CacheDatabase:
                 height INTEGER NOT NULL CHECK(height > 0),
                 source_window TEXT,
                 source_app TEXT,
-                captured_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL,
+                captured_at INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL,
                 file_size_kb INTEGER,
+                phash INTEGER,
                 created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -66,13 +251,22 @@ class CacheDatabase:
                 element_count INTEGER DEFAULT 0 CHECK(element_count >= 0),
                 result_json TEXT NOT NULL,
                 hit_count INTEGER DEFAULT 0 CHECK(hit_count >= 0),
-                last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_accessed_at INTEGER,
                 status TEXT NOT NULL DEFAULT 'success',
+                expires_at INTEGER,
                 created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE CASCADE
             )
         """)
 
+        # Databases created before bboxes were packed: element rows are
+        # derived from result_json, so the table is simply rebuilt
+        element_columns = {
+            row['name'] for row in self.conn.execute("PRAGMA table_info(ui_elements)")
+        }
+        if element_columns and 'bbox' not in element_columns:
+            self.conn.execute("DROP TABLE ui_elements")
+
         # Create ui_elements table
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS ui_elements (
@@ -80,10 +274,7 @@ class CacheDatabase:
                 result_id INTEGER NOT NULL,
                 element_type TEXT NOT NULL,
                 text_content TEXT,
-                x1 INTEGER NOT NULL,
-                y1 INTEGER NOT NULL,
-                x2 INTEGER NOT NULL,
-                y2 INTEGER NOT NULL,
+                bbox BLOB NOT NULL,
                 confidence REAL NOT NULL CHECK(confidence >= 0 AND confidence <= 1),
                 actionable BOOLEAN NOT NULL DEFAULT 0,
                 parent_element_id INTEGER,
@@ -93,10 +284,38 @@ class CacheDatabase:
             )
         """)
 
+        # Databases created before results carried their own expiry
+        result_columns = {
+            row['name'] for row in self.conn.execute("PRAGMA table_info(recognition_results)")
+        }
+        if 'expires_at' not in result_columns:
+            self.conn.execute("ALTER TABLE recognition_results ADD COLUMN expires_at INTEGER")
+
+        # Databases created before perceptual hashes were stored
+        screenshot_columns = {
+            row['name'] for row in self.conn.execute("PRAGMA table_info(screenshots)")
+        }
+        if 'phash' not in screenshot_columns:
+            self.conn.execute("ALTER TABLE screenshots ADD COLUMN phash INTEGER")
+
+        # Entries from before epoch-second timestamps (user_version 0) would
+        # never compare as expired against integers; they are short-lived,
+        # so drop them once
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            self.conn.execute("DELETE FROM screenshots WHERE typeof(expires_at) != 'integer'")
+            self.conn.execute("""
+                DELETE FROM recognition_results
+                WHERE typeof(expires_at) != 'integer'
+                   OR typeof(last_accessed_at) != 'integer'
+            """)
+            self.conn.execute("PRAGMA user_version = 1")
+
         # Create indexes
         self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_screenshots_hash ON screenshots(sha256_hash)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_screenshots_expires ON screenshots(expires_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_screenshots_size ON screenshots(width, height)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_screenshot ON recognition_results(screenshot_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_hash_expires ON recognition_results(screenshot_id, expires_at)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON recognition_results(last_accessed_at ASC)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_elements_result ON ui_elements(result_id)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_elements_actionable ON ui_elements(actionable)")
@@ -112,38 +331,93 @@ class CacheDatabase:
         Returns:
             Recognition result dict if cache hit, None otherwise
         """
-        cursor = self.conn.execute("""
-            SELECT r.id, r.result_json, r.hit_count, r.model_name, r.inference_time_ms
-            FROM recognition_results r
-            JOIN screenshots s ON r.screenshot_id = s.id
-            WHERE s.sha256_hash = ?
-              AND s.expires_at > ?
-            ORDER BY r.created_at DESC
-            LIMIT 1
-        """, (screenshot_hash, datetime.now().isoformat()))
+        cursor = self.conn.execute(
+            _SQL_LOOKUP, (screenshot_hash, int(time.time()))
+        )
 
         row = cursor.fetchone()
         if not row:
             logger.debug(f"Cache miss: {screenshot_hash[:8]}")
             return None
 
-        # Update cache hit statistics
-        self.conn.execute("""
-            UPDATE recognition_results
-            SET hit_count = hit_count + 1,
-                last_accessed_at = ?
-            WHERE id = ?
-        """, (datetime.now().isoformat(), row['id']))
-        self.conn.commit()
+        logger.debug(f"Cache hit: {screenshot_hash[:8]}")
+        return self._row_to_result(row)
+
+    def lookup_similar(
+        self,
+        phash: int,
+        width: int,
+        height: int,
+        max_distance: int
+    ) -> Optional[Dict[str, Any]]:
+        """Lookup cached result for a visually near-identical screenshot.
+
+        Fallback for an exact-hash miss: picks the unexpired screenshot of the
+        same size whose perceptual hash is closest to phash, if within
+        max_distance bits. Only same-size screenshots qualify, since the
+        cached bboxes are used as click coordinates.
+
+        Args:
+            phash: 64-bit perceptual hash of the new screenshot
+            width: Screenshot width
+            height: Screenshot height
+            max_distance: Hamming distance below which screens match
+
+        Returns:
+            Recognition result dict if a similar entry exists, None otherwise
+        """
+        now = int(time.time())
+
+        best_id = None
+        best_distance = max_distance
+        candidates = self.conn.execute(
+            _SQL_SIMILAR_CANDIDATES, (width, height, now)
+        )
+        for row in candidates:
+            distance = hamming_distance(row['phash'] & _PHASH_MASK, phash)
+            if distance < best_distance:
+                best_id, best_distance = row['id'], distance
+
+        if best_id is None:
+            return None
+
+        row = self.conn.execute(
+            _SQL_LOOKUP_BY_SCREENSHOT, (best_id, now)
+        ).fetchone()
+        if not row:
+            return None
+
+        logger.debug(f"Similar cache hit: distance={best_distance}")
+        return self._row_to_result(row)
+
+    def _row_to_result(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Record a cache hit and parse the cached result row."""
+        # Hit statistics are written by the background writer
+        self._hit_queue.append((row['id'], int(time.time())))
 
         # Parse and return result
-        result = json.loads(row['result_json'])
+        result = _loads_json(row['result_json'])
         result['_cache_hit'] = True
         result['_hit_count'] = row['hit_count'] + 1
-
-        logger.debug(f"Cache hit: {screenshot_hash[:8]}")
         return result
 
+    def lookup_cache_meta(self, screenshot_hash: str) -> Optional[Dict[str, Any]]:
+        """Lookup cached result metadata without reading the result JSON.
+
+        Does not count as a cache hit.
+
+        Args:
+            screenshot_hash: SHA-256 hash of screenshot
+
+        Returns:
+            Dict with id, hit_count, model_name, inference_time_ms and
+            element_count if cached, None otherwise
+        """
+        row = self.conn.execute(
+            _SQL_LOOKUP_META, (screenshot_hash, int(time.time()))
+        ).fetchone()
+        return dict(row) if row else None
+
     def insert_cache(
         self,
         screenshot_hash: str,
@@ -152,7 +426,8 @@ class CacheDatabase:
         recognition_result: Dict[str, Any],
         model_name: str,
         ttl_minutes: int = 5,
-        max_results: int = 1000
+        max_results: int = 1000,
+        phash: Optional[int] = None
     ):
         """Insert recognition result into cache.
 
@@ -164,32 +439,11 @@ class CacheDatabase:
             model_name: Model name used for inference
             ttl_minutes: Time-to-live in minutes
             max_results: Max cached results before LRU eviction
+            phash: 64-bit perceptual hash for similar-screen lookups
         """
-        # Check if cache size limit exceeded
-        count = self.conn.execute("SELECT COUNT(*) as cnt FROM recognition_results").fetchone()['cnt']
-        if count >= max_results:
-            self._evict_lru(max_results)
-
         # Insert screenshot (or get existing)
-        now = datetime.now()
-        expires_at = now + timedelta(minutes=ttl_minutes)
-
-        self.conn.execute("""
-            INSERT OR IGNORE INTO screenshots (
-                sha256_hash, width, height,
-                source_window, captured_at, expires_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            screenshot_hash, screenshot_width, screenshot_height,
-            recognition_result.get('source_window', 'Unknown'),
-            now.isoformat(), expires_at.isoformat()
-        ))
-
-        # Get screenshot_id
-        screenshot_id = self.conn.execute(
-            "SELECT id FROM screenshots WHERE sha256_hash = ?",
-            (screenshot_hash,)
-        ).fetchone()['id']
+        now = int(time.time())
+        expires_at = now + ttl_minutes * 60
 
         # Calculate metrics
         elements = recognition_result.get('elements', [])
@@ -197,75 +451,120 @@ class CacheDatabase:
         avg_confidence = sum(e['confidence'] for e in elements) / element_count if element_count > 0 else 0.0
         inference_time_ms = int(recognition_result.get('inference_time', 0) * 1000)
 
-        # Insert recognition result
-        cursor = self.conn.execute("""
-            INSERT INTO recognition_results (
+        # Eviction, screenshot, result and elements commit as one transaction
+        with self._write_lock, self.conn:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+
+            # Check if cache size limit exceeded (leave room for the new row)
+            if self._cached_row_count >= max_results:
+                self._evict_lru(max_results - 1)
+
+            cursor = self.conn.execute(_SQL_INSERT_SCREENSHOT, (
+                screenshot_hash, screenshot_width, screenshot_height,
+                recognition_result.get('source_window', 'Unknown'),
+                now, expires_at, _phash_to_sqlite(phash)
+            ))
+
+            # Get screenshot_id (only query when the row already existed)
+            if cursor.rowcount == 1:
+                screenshot_id = cursor.lastrowid
+            else:
+                screenshot_id = self.conn.execute(
+                    _SQL_SELECT_SCREENSHOT_ID, (screenshot_hash,)
+                ).fetchone()['id']
+
+            # Insert recognition result
+            cursor = self.conn.execute(_SQL_INSERT_RESULT, (
                 screenshot_id, model_name, inference_time_ms,
-                confidence_score, element_count, result_json, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            screenshot_id, model_name, inference_time_ms,
-            avg_confidence, element_count, json.dumps(recognition_result),
-            recognition_result.get('status', 'success')
-        ))
-        result_id = cursor.lastrowid
-
-        # Insert UI elements
-        for element in elements:
-            self.conn.execute("""
-                INSERT INTO ui_elements (
-                    result_id, element_type, text_content,
-                    x1, y1, x2, y2, confidence, actionable
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result_id, element['type'], element.get('text', ''),
-                element['bbox'][0], element['bbox'][1],
-                element['bbox'][2], element['bbox'][3],
-                element['confidence'], element.get('actionable', False)
+                avg_confidence, element_count, _dumps_json(recognition_result),
+                recognition_result.get('status', 'success'),
+                expires_at, now
             ))
+            result_id = cursor.lastrowid
+
+            # Insert UI elements
+            self.conn.executemany(_SQL_INSERT_ELEMENT, [
+                (
+                    result_id, e['type'], e.get('text', ''),
+                    _pack_bbox(e['bbox']),
+                    e['confidence'], e.get('actionable', False)
+                )
+                for e in elements
+            ])
+            self._cached_row_count += 1
 
-        self.conn.commit()
         logger.debug(f"Cached result: {screenshot_hash[:8]}, elements={element_count}")
 
     def _cleanup_expired(self) -> int:
         """Remove expired screenshots and cascaded results.
 
+        Holds the write lock so the row count stays in step with inserts.
+
         Returns:
             Number of deleted screenshots
         """
-        now = datetime.now().isoformat()
-        cursor = self.conn.execute("DELETE FROM screenshots WHERE expires_at < ?", (now,))
-        deleted_count = cursor.rowcount
-        self.conn.commit()
+        now = int(time.time())
+        with self._write_lock:
+            cursor = self.conn.execute(_SQL_DELETE_EXPIRED, (now,))
+            deleted_count = cursor.rowcount
+            self.conn.commit()
+
+            if deleted_count > 0:
+                # Results were removed by cascade, so rowcount doesn't cover them
+                self._cached_row_count = self._count_results()
 
         if deleted_count > 0:
             logger.debug(f"Cleaned up {deleted_count} expired cache entries")
 
         return deleted_count
 
+    def _hit_writer_loop(self):
+        """Flush queued cache hits periodically (background thread)."""
+        while not self._stop_event.wait(HIT_FLUSH_INTERVAL):
+            try:
+                self._flush_hits()
+            except Exception:
+                logger.exception("Failed to flush cache hit statistics")
+
+    def _flush_hits(self):
+        """Write queued cache hits in one batched UPDATE."""
+        if not self._hit_queue:
+            return
+
+        # Aggregate per result: (hit increment, latest access time)
+        pending = {}
+        while self._hit_queue:
+            result_id, accessed_at = self._hit_queue.popleft()
+            hits, _ = pending.get(result_id, (0, None))
+            pending[result_id] = (hits + 1, accessed_at)
+
+        with self._write_lock, self.conn:
+            self.conn.executemany(_SQL_RECORD_HITS, [
+                (hits, accessed_at, result_id)
+                for result_id, (hits, accessed_at) in pending.items()
+            ])
+
+    def _count_results(self) -> int:
+        """Count cached recognition results."""
+        return self.conn.execute(_SQL_COUNT_RESULTS).fetchone()['cnt']
+
     def _evict_lru(self, keep_count: int):
         """Evict least recently used results.
 
+        Runs inside the caller's transaction; the caller commits.
+
         Args:
             keep_count: Number of results to keep
         """
-        current_count = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM recognition_results"
-        ).fetchone()['cnt']
+        current_count = self._cached_row_count
 
         if current_count <= keep_count:
             return
 
         to_delete = current_count - keep_count
-        self.conn.execute("""
-            DELETE FROM recognition_results
-            WHERE id IN (
-                SELECT id FROM recognition_results
-                ORDER BY last_accessed_at ASC
-                LIMIT ?
-            )
-        """, (to_delete,))
-        self.conn.commit()
+        cursor = self.conn.execute(_SQL_EVICT_LRU, (to_delete,))
+        self._cached_row_count -= cursor.rowcount
 
         logger.debug(f"Evicted {to_delete} LRU cache entries")
 
@@ -275,31 +574,18 @@ class CacheDatabase:
         Returns:
             Dictionary with cache metrics
         """
-        stats = {}
+        self._flush_hits()
 
-        # Total counts
-        stats['total_screenshots'] = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM screenshots"
-        ).fetchone()['cnt']
+        # Counts and hit statistics in one round-trip
+        row = self.conn.execute(_SQL_STATS).fetchone()
 
-        stats['total_results'] = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM recognition_results"
-        ).fetchone()['cnt']
-
-        stats['total_elements'] = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM ui_elements"
-        ).fetchone()['cnt']
-
-        # Cache hit statistics
-        hit_stats = self.conn.execute("""
-            SELECT
-                SUM(hit_count) as total_hits,
-                AVG(hit_count) as avg_hits
-            FROM recognition_results
-        """).fetchone()
-
-        stats['total_cache_hits'] = hit_stats['total_hits'] or 0
-        stats['avg_hits_per_result'] = hit_stats['avg_hits'] or 0
+        stats = {
+            'total_screenshots': row['total_screenshots'],
+            'total_results': row['total_results'],
+            'total_elements': row['total_elements'],
+            'total_cache_hits': row['total_hits'] or 0,
+            'avg_hits_per_result': row['avg_hits'] or 0,
+        }
 
         # Calculate hit rate
         total_accesses = stats['total_results'] + stats['total_cache_hits']
@@ -309,19 +595,30 @@ class CacheDatabase:
 
     def clear(self):
         """Clear all cached data."""
-        self.conn.execute("DELETE FROM ui_elements")
-        self.conn.execute("DELETE FROM recognition_results")
-        self.conn.execute("DELETE FROM screenshots")
-        self.conn.commit()
-
-        # Vacuum to reclaim space
-        self.conn.execute("VACUUM")
+        with self._write_lock:
+            self._hit_queue.clear()
+            self.conn.execute("DELETE FROM ui_elements")
+            self.conn.execute("DELETE FROM recognition_results")
+            self.conn.execute("DELETE FROM screenshots")
+            self.conn.commit()
+            self._cached_row_count = 0
+
+            # Vacuum to reclaim space; under the lock so no other writer
+            # has a transaction open on the shared connection
+            self.conn.execute("VACUUM")
 
         logger.info("Cache cleared")
 
     def close(self):
-        """Close database connection."""
-        self.conn.close()
+        """Flush pending hit statistics and close database connection."""
+        self._stop_event.set()
+        self._cleanup_thread.join()
+        self._hit_writer.join(timeout=HIT_FLUSH_INTERVAL * 2)
+        self._flush_hits()
+
+        # A writer still running after the timeout finishes before the close
+        with self._write_lock:
+            self.conn.close()
         logger.info("Cache database closed")
 
 
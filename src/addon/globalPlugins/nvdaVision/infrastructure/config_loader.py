@@ -4,13 +4,107 @@ This module manages plugin configuration with encrypted API keys
 to satisfy real.md constraint 2.
 """
 
+import copy
 from pathlib import Path
 from typing import Any, Dict, Optional
-import yaml
 
 from ..security.encryption import DPAPIEncryption
 from .logger import logger
 
+# yaml is imported on first load()/save(), off NVDA's plugin import path
+_yaml = None
+_Loader = None
+_Dumper = None
+
+# Entries kept by ConfigManager.get()'s lookup cache before it is reset
+_GET_CACHE_MAX = 128
+
+_MISSING = object()
+
+# security.<name>_encrypted holds the DPAPI blob for the in-memory <name>
+_ENCRYPTED_SUFFIX = "_encrypted"
+_ENCRYPTED_SUFFIX_LEN = len(_ENCRYPTED_SUFFIX)
+_API_KEY_SUFFIX = "_api_key"
+
+# Default configuration; _get_default_config() hands out deep copies
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "version": "1.0.0",
+    "language": "zh-CN",
+    "enable_cloud_api": False,
+    "enable_gzip_upload": False,  # Compress Doubao request bodies
+    "models": {
+        "preference": "auto",
+        "timeout_seconds": 15.0,
+        "confidence_threshold": 0.7,
+        "uitars": {
+            "enabled": True,
+            "model_path": "models/uitars-7b",
+            "device": "cuda",
+            "dtype": "float16",
+        },
+        "minicpm": {
+            "enabled": True,
+            "model_path": "models/minicpm-v-2.6",
+            "device": "cpu",
+        },
+        "doubao": {
+            "enabled": False,
+            "api_endpoint": "https://ark.cn-beijing.volces.com/api/v3/visual",
+        },
+    },
+    "cache": {
+        "enabled": True,
+        "ttl_seconds": 300,
+        "max_size": 100,
+        "fuzzy_hamming_threshold": 5,
+    },
+    "prefetch": {
+        "enabled": False,  # Polls the screen in the background
+        "capacity": 4,
+        "poll_interval": 2.0,
+    },
+    "ui": {
+        "announce_confidence": True,
+        "announce_position": True,
+        "auto_recognize_on_focus": False,
+        "progress_feedback_delay": 5.0,
+    },
+    "shortcuts": {
+        "recognize_screen": "NVDA+shift+v",
+        "recognize_at_cursor": "NVDA+shift+c",
+        "next_element": "NVDA+shift+n",
+        "previous_element": "NVDA+shift+p",
+    },
+    "privacy": {
+        "local_processing_only": True,
+        "blur_sensitive_regions": False,
+        "log_screenshots": False,
+    },
+    "security": {},
+    "logging": {
+        "level": "INFO",
+        "retention_days": 7,
+        "max_file_size_mb": 10,
+    },
+}
+
+
+def _import_yaml():
+    """Import yaml once and pick its loader/dumper.
+
+    Returns:
+        The yaml module
+    """
+    global _yaml, _Loader, _Dumper
+    if _yaml is None:
+        import yaml
+
+        # libyaml C bindings when available; both are the safe variants
+        _Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        _Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        _yaml = yaml
+    return _yaml
+
 
 class ConfigManager:
     """Manage configuration with validation and encryption."""
@@ -26,6 +120,9 @@ class ConfigManager:
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.config: Dict[str, Any] = {}
 
+        # Dotted key -> value found by get(); reset whenever config changes
+        self._get_cache: Dict[str, Any] = {}
+
         # Ensure config directory exists
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -34,6 +131,8 @@ class ConfigManager:
 
     def load(self):
         """Load configuration from YAML file."""
+        self._get_cache.clear()
+
         if not self.config_path.exists():
             logger.warning(f"Config file not found: {self.config_path}")
             self.config = self._get_default_config()
@@ -43,10 +142,9 @@ class ConfigManager:
 
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f) or {}
+                raw_text = f.read()
 
-            # Decrypt API keys
-            self._decrypt_api_keys()
+            self._parse(raw_text)
 
             logger.info(f"Configuration loaded from {self.config_path}")
 
@@ -54,16 +152,25 @@ class ConfigManager:
             logger.exception("Failed to load configuration")
             self.config = self._get_default_config()
 
+    def _parse(self, raw_text: str):
+        """Parse the YAML text and decrypt API keys."""
+        self.config = _import_yaml().load(raw_text, Loader=_Loader) or {}
+
+        # Decrypt API keys
+        self._decrypt_api_keys()
+
     def save(self):
         """Save configuration to YAML file."""
         try:
             # Create copy without decrypted keys
             config_to_save = self._prepare_for_save()
 
+            yaml = _import_yaml()
             with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.safe_dump(
+                yaml.dump(
                     config_to_save,
                     f,
+                    Dumper=_Dumper,
                     default_flow_style=False,
                     allow_unicode=True
                 )
@@ -91,6 +198,10 @@ class ConfigManager:
             >>> config.get("nonexistent.key", default=42)
             42
         """
+        value = self._get_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
         keys = key.split('.')
         value = self.config
 
@@ -100,6 +211,10 @@ class ConfigManager:
             else:
                 return default
 
+        if len(self._get_cache) >= _GET_CACHE_MAX:
+            self._get_cache.clear()
+        self._get_cache[key] = value
+
         return value
 
     def set(self, key: str, value: Any):
@@ -112,14 +227,14 @@ class ConfigManager:
         Example:
             >>> config.set("models.timeout_seconds", 20.0)
         """
+        self._get_cache.clear()
+
         keys = key.split('.')
         target = self.config
 
         # Navigate to parent
         for k in keys[:-1]:
-            if k not in target:
-                target[k] = {}
-            target = target[k]
+            target = target.setdefault(k, {})
 
         # Set value
         target[keys[-1]] = value
@@ -135,10 +250,11 @@ class ConfigManager:
         encrypted = DPAPIEncryption.encrypt(plaintext_key)
 
         # Store encrypted version
-        self.set(f"security.{key_name}_encrypted", encrypted)
+        self.set(f"security.{key_name}{_ENCRYPTED_SUFFIX}", encrypted)
 
         # Keep decrypted in memory for current session
         self.config[key_name] = plaintext_key
+        self._get_cache.clear()
 
         # Save to file (only encrypted version)
         self.save()
@@ -147,17 +263,38 @@ class ConfigManager:
 
     def _decrypt_api_keys(self):
         """Decrypt API keys from config."""
+        self._get_cache.clear()
+
         security = self.config.get("security", {})
 
-        for key, value in security.items():
-            if key.endswith("_encrypted"):
-                api_key_name = key.replace("_encrypted", "")
-                try:
-                    decrypted = DPAPIEncryption.decrypt(value)
-                    self.config[api_key_name] = decrypted
+        pairs = [
+            (key[:-_ENCRYPTED_SUFFIX_LEN], value)
+            for key, value in security.items()
+            if key.endswith(_ENCRYPTED_SUFFIX)
+        ]
+        if not pairs:
+            return
+
+        # One batch call; on failure fall back to per-key so one bad
+        # key doesn't lose the others
+        decrypt_many = getattr(DPAPIEncryption, "decrypt_many", None)
+        if decrypt_many is not None:
+            try:
+                decrypted = decrypt_many([value for _, value in pairs])
+            except Exception:
+                logger.debug("Batch decryption failed, decrypting keys one by one")
+            else:
+                for (api_key_name, _), plaintext in zip(pairs, decrypted):
+                    self.config[api_key_name] = plaintext
                     logger.debug(f"Decrypted API key: {api_key_name}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt {api_key_name}: {e}")
+                return
+
+        for api_key_name, value in pairs:
+            try:
+                self.config[api_key_name] = DPAPIEncryption.decrypt(value)
+                logger.debug(f"Decrypted API key: {api_key_name}")
+            except Exception as e:
+                logger.error(f"Failed to decrypt {api_key_name}: {e}")
 
     def _prepare_for_save(self) -> Dict[str, Any]:
         """Prepare config for saving (remove decrypted keys).
@@ -165,71 +302,17 @@ class ConfigManager:
         Returns:
             Config dict safe to save to file
         """
-        import copy
-        config_copy = copy.deepcopy(self.config)
-
-        # Remove decrypted API keys
-        for key in list(config_copy.keys()):
-            if key.endswith("_api_key") and not key.endswith("_encrypted"):
-                del config_copy[key]
-
-        return config_copy
+        # Only top-level keys are dropped, so a shallow copy is enough
+        # (yaml.dump never mutates the nested dicts it shares with self.config)
+        return {
+            key: value
+            for key, value in self.config.items()
+            if not key.endswith(_API_KEY_SUFFIX)
+        }
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
-        return {
-            "version": "1.0.0",
-            "language": "zh-CN",
-            "enable_cloud_api": False,
-            "models": {
-                "preference": "auto",
-                "timeout_seconds": 15.0,
-                "confidence_threshold": 0.7,
-                "uitars": {
-                    "enabled": True,
-                    "model_path": "models/uitars-7b",
-                    "device": "cuda",
-                    "dtype": "float16",
-                },
-                "minicpm": {
-                    "enabled": True,
-                    "model_path": "models/minicpm-v-2.6",
-                    "device": "cpu",
-                },
-                "doubao": {
-                    "enabled": False,
-                    "api_endpoint": "https://ark.cn-beijing.volces.com/api/v3/visual",
-                },
-            },
-            "cache": {
-                "enabled": True,
-                "ttl_seconds": 300,
-                "max_size": 100,
-            },
-            "ui": {
-                "announce_confidence": True,
-                "announce_position": True,
-                "auto_recognize_on_focus": False,
-                "progress_feedback_delay": 5.0,
-            },
-            "shortcuts": {
-                "recognize_screen": "NVDA+shift+v",
-                "recognize_at_cursor": "NVDA+shift+c",
-                "next_element": "NVDA+shift+n",
-                "previous_element": "NVDA+shift+p",
-            },
-            "privacy": {
-                "local_processing_only": True,
-                "blur_sensitive_regions": False,
-                "log_screenshots": False,
-            },
-            "security": {},
-            "logging": {
-                "level": "INFO",
-                "retention_days": 7,
-                "max_file_size_mb": 10,
-            },
-        }
+        return copy.deepcopy(_DEFAULT_CONFIG)
 
 
 __all__ = ["ConfigManager"]
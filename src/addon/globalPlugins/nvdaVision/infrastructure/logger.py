@@ -16,6 +16,21 @@ loguru_logger.remove()
 # Global logger instance
 logger = loguru_logger
 
+# Handler ids added by setup_logger(), removed by shutdown_logger()
+_handler_ids = []
+
+# Patterns used by sanitize_log_record(), compiled once
+_API_KEY_RE = re.compile(r'\b([sma]k-[a-zA-Z0-9]{4})[a-zA-Z0-9]+([a-zA-Z0-9]{4})\b')
+_B64_RE = re.compile(r'\b([A-Za-z0-9+/]{8})[A-Za-z0-9+/]{32,}([A-Za-z0-9+/=]{8})\b')
+_PWD_RE = re.compile(
+    r'(password|pwd|pass)["\s:=]+["\']?([^\s"\',]{2})[^\s"\',]*([^\s"\',]{2})',
+    re.IGNORECASE
+)
+_TOK_RE = re.compile(
+    r'(token|auth|bearer)["\s:=]+["\']?([^\s"\',]{4})[^\s"\',]*([^\s"\',]{4})',
+    re.IGNORECASE
+)
+
 
 def setup_logger(
     log_dir: Path,
@@ -36,8 +51,16 @@ def setup_logger(
     # Ensure log directory exists
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    # Drop handlers from a previous setup (plugin reload)
+    shutdown_logger()
+
+    # Both handlers use enqueue=True: the sanitizing filter and message
+    # formatting still run in the calling thread, but the sink write
+    # (file I/O, rotation, compression) is queued to a background thread,
+    # so logging from NVDA's main thread never waits on the disk
+
     # Console handler (colored, human-readable)
-    logger.add(
+    _handler_ids.append(logger.add(
         sys.stderr,
         format=(
             "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
@@ -47,14 +70,15 @@ def setup_logger(
         ),
         level=level,
         colorize=True,
+        enqueue=True,
         backtrace=True,
         diagnose=True,
         filter=sanitize_log_record,  # Apply security filter
-    )
+    ))
 
     # File handler (structured, machine-readable)
     log_file = log_dir / "nvda_vision_{time:YYYY-MM-DD}.log"
-    logger.add(
+    _handler_ids.append(logger.add(
         log_file,
         rotation=f"{max_file_size_mb} MB",  # Rotate at size limit
         retention=f"{retention_days} days",  # Keep for N days
@@ -66,11 +90,11 @@ def setup_logger(
             "{name}:{function}:{line} - "
             "{message}"
         ),
-        enqueue=True,  # Thread-safe
+        enqueue=True,  # Writes happen on a background thread
         backtrace=True,
         diagnose=True,
         filter=sanitize_log_record,  # Apply security filter
-    )
+    ))
 
     logger.info(
         f"Logger initialized: level={level}, log_dir={log_dir}, "
@@ -78,6 +102,19 @@ def setup_logger(
     )
 
 
+def shutdown_logger() -> None:
+    """Flush queued log records and remove handlers added by setup_logger().
+
+    Stops the background writer threads; call on plugin termination.
+    """
+    while _handler_ids:
+        handler_id = _handler_ids.pop()
+        try:
+            logger.remove(handler_id)  # Waits for the queue to drain
+        except ValueError:
+            pass  # Already removed
+
+
 def sanitize_log_record(record: dict) -> bool:
     """Filter to remove sensitive data from logs.
 
@@ -91,35 +128,28 @@ def sanitize_log_record(record: dict) -> bool:
     """
     message = record["message"]
 
+    # Nothing shorter than 8 characters can match any of the patterns
+    if len(message) < 8:
+        return True
+
+    # Cheap substring checks gate each regex; most messages match none
+    low = message.lower()
+
     # Mask API keys (starts with sk-, mk-, ak- etc.)
-    message = re.sub(
-        r'\b([sma]k-[a-zA-Z0-9]{4})[a-zA-Z0-9]+([a-zA-Z0-9]{4})\b',
-        r'\1...\2',
-        message
-    )
+    if 'k-' in message:
+        message = _API_KEY_RE.sub(r'\1...\2', message)
 
     # Mask long base64 strings (potential encrypted keys)
-    message = re.sub(
-        r'\b([A-Za-z0-9+/]{8})[A-Za-z0-9+/]{32,}([A-Za-z0-9+/=]{8})\b',
-        r'\1...\2',
-        message
-    )
+    if len(message) >= 48:
+        message = _B64_RE.sub(r'\1...\2', message)
 
-    # Mask potential passwords
-    message = re.sub(
-        r'(password|pwd|pass)["\s:=]+["\']?([^\s"\',]{2})[^\s"\',]*([^\s"\',]{2})',
-        r'\1=\2...\3',
-        message,
-        flags=re.IGNORECASE
-    )
+    # Mask potential passwords ("pass" also covers "password")
+    if 'pass' in low or 'pwd' in low:
+        message = _PWD_RE.sub(r'\1=\2...\3', message)
 
     # Mask potential tokens
-    message = re.sub(
-        r'(token|auth|bearer)["\s:=]+["\']?([^\s"\',]{4})[^\s"\',]*([^\s"\',]{4})',
-        r'\1=\2...\3',
-        message,
-        flags=re.IGNORECASE
-    )
+    if 'token' in low or 'auth' in low or 'bearer' in low:
+        message = _TOK_RE.sub(r'\1=\2...\3', message)
 
     record["message"] = message
     return True
@@ -200,6 +230,7 @@ def log_error_with_context(error: Exception, context: str, **kwargs):
 __all__ = [
     "logger",
     "setup_logger",
+    "shutdown_logger",
     "get_logger",
     "log_model_event",
     "log_recognition_event",
@@ -7,14 +7,67 @@ Only used as fallback when local models fail and user has given consent.
 from pathlib import Path
 from typing import List, Optional
 import time
-import base64
-import io
+import json
 
 from .base_adapter import VisionModelAdapter
 from ..schemas.screenshot import Screenshot
 from ..schemas.ui_element import UIElement
 from ..infrastructure.logger import logger
 
+try:
+    import orjson
+
+    _dumps_json = orjson.dumps
+    _loads_json = orjson.loads
+except ImportError:
+    # orjson is optional; NVDA's bundled Python only has the stdlib json
+    def _dumps_json(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads_json = json.loads
+
+# Instruction sent with every screenshot
+_DOUBAO_PROMPT = (
+    "You are a UI accessibility assistant for visually impaired users. "
+    "Analyze this screenshot and identify ALL UI elements with DETAILED descriptions.\n\n"
+
+    "CRITICAL REQUIREMENTS:\n"
+    "1. For EVERY element, provide a meaningful description\n"
+    "   - Text buttons: use the visible text\n"
+    "   - Icon buttons: DESCRIBE what the icon represents\n"
+    "   - Even if there's no text label, YOU MUST infer the purpose\n\n"
+
+    "2. Common icon patterns:\n"
+    "   - Microphone/mic → \"microphone\" or \"mute\"\n"
+    "   - Camera → \"camera\" or \"video\"\n"
+    "   - Monitor/screen → \"share screen\"\n"
+    "   - Speech bubble → \"chat\" or \"messages\"\n"
+    "   - People icon → \"participants\" or \"members\"\n"
+    "   - Gear icon → \"settings\"\n"
+    "   - Three dots → \"more options\" or \"menu\"\n"
+    "   - Plus (+) → \"add\" or \"new\"\n"
+    "   - X icon → \"close\" or \"exit\"\n\n"
+
+    "OUTPUT FORMAT (JSON array only):\n"
+    "[\n"
+    "  {\n"
+    "    \"type\": \"button|icon_button|textbox|link|text|label|icon\",\n"
+    "    \"text\": \"descriptive text or icon meaning\",\n"
+    "    \"bbox\": [x1, y1, x2, y2],\n"
+    "    \"confidence\": 0.0-1.0,\n"
+    "    \"actionable\": true|false\n"
+    "  }\n"
+    "]\n\n"
+
+    "EXAMPLES:\n"
+    "[{\"type\":\"icon_button\",\"text\":\"microphone mute\",\"bbox\":[100,500,140,540],\"confidence\":0.92,\"actionable\":true},"
+    "{\"type\":\"icon_button\",\"text\":\"camera video\",\"bbox\":[145,500,185,540],\"confidence\":0.94,\"actionable\":true},"
+    "{\"type\":\"icon_button\",\"text\":\"share screen\",\"bbox\":[190,500,230,540],\"confidence\":0.90,\"actionable\":true}]\n\n"
+
+    "CRITICAL: NEVER return empty \"text\" field. Always describe what you see. "
+    "Return ONLY the JSON array, no explanations."
+)
+
 
 class DoubaoAPIAdapter(VisionModelAdapter):
     """Adapter for Doubao cloud vision API.
@@ -43,6 +96,10 @@ class DoubaoAPIAdapter(VisionModelAdapter):
         self.api_endpoint = api_endpoint
         self.config = config or {}
         self._request_count = 0
+        self._session = None  # requests.Session, created by load()
+
+        # Opt-in: not every Doubao gateway accepts gzip request bodies
+        self._gzip_upload = bool(self.config.get("enable_gzip_upload", False))
 
     @property
     def name(self) -> str:
@@ -77,6 +134,17 @@ class DoubaoAPIAdapter(VisionModelAdapter):
         if len(self.api_key) < 20:
             raise RuntimeError("Doubao API key appears invalid (too short)")
 
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # One pooled session so repeated requests reuse the TLS connection
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
         self.is_loaded = True
         logger.info("Doubao API client initialized")
 
@@ -115,12 +183,7 @@ class DoubaoAPIAdapter(VisionModelAdapter):
             # Prepare image (downscale for API)
             image_base64 = self._prepare_image(screenshot)
 
-            # Prepare API request
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-
+            # Prepare API request (auth headers are set on the session)
             payload = {
                 "model": "doubao-vision-pro",  # Doubao vision model
                 "messages": [
@@ -129,46 +192,7 @@ class DoubaoAPIAdapter(VisionModelAdapter):
                         "content": [
                             {
                                 "type": "text",
-                                "text": (
-                                    "You are a UI accessibility assistant for visually impaired users. "
-                                    "Analyze this screenshot and identify ALL UI elements with DETAILED descriptions.\n\n"
-
-                                    "CRITICAL REQUIREMENTS:\n"
-                                    "1. For EVERY element, provide a meaningful description\n"
-                                    "   - Text buttons: use the visible text\n"
-                                    "   - Icon buttons: DESCRIBE what the icon represents\n"
-                                    "   - Even if there's no text label, YOU MUST infer the purpose\n\n"
-
-                                    "2. Common icon patterns:\n"
-                                    "   - Microphone/mic → \"microphone\" or \"mute\"\n"
-                                    "   - Camera → \"camera\" or \"video\"\n"
-                                    "   - Monitor/screen → \"share screen\"\n"
-                                    "   - Speech bubble → \"chat\" or \"messages\"\n"
-                                    "   - People icon → \"participants\" or \"members\"\n"
-                                    "   - Gear icon → \"settings\"\n"
-                                    "   - Three dots → \"more options\" or \"menu\"\n"
-                                    "   - Plus (+) → \"add\" or \"new\"\n"
-                                    "   - X icon → \"close\" or \"exit\"\n\n"
-
-                                    "OUTPUT FORMAT (JSON array only):\n"
-                                    "[\n"
-                                    "  {\n"
-                                    "    \"type\": \"button|icon_button|textbox|link|text|label|icon\",\n"
-                                    "    \"text\": \"descriptive text or icon meaning\",\n"
-                                    "    \"bbox\": [x1, y1, x2, y2],\n"
-                                    "    \"confidence\": 0.0-1.0,\n"
-                                    "    \"actionable\": true|false\n"
-                                    "  }\n"
-                                    "]\n\n"
-
-                                    "EXAMPLES:\n"
-                                    "[{\"type\":\"icon_button\",\"text\":\"microphone mute\",\"bbox\":[100,500,140,540],\"confidence\":0.92,\"actionable\":true},"
-                                    "{\"type\":\"icon_button\",\"text\":\"camera video\",\"bbox\":[145,500,185,540],\"confidence\":0.94,\"actionable\":true},"
-                                    "{\"type\":\"icon_button\",\"text\":\"share screen\",\"bbox\":[190,500,230,540],\"confidence\":0.90,\"actionable\":true}]\n\n"
-
-                                    "CRITICAL: NEVER return empty \"text\" field. Always describe what you see. "
-                                    "Return ONLY the JSON array, no explanations."
-                                )
+                                "text": _DOUBAO_PROMPT
                             },
                             {
                                 "type": "image_url",
@@ -183,13 +207,29 @@ class DoubaoAPIAdapter(VisionModelAdapter):
                 "max_tokens": 2048
             }
 
+            body = _dumps_json(payload)
+
             # Make API request with timeout
-            response = requests.post(
-                self.api_endpoint,
-                headers=headers,
-                json=payload,
-                timeout=timeout
-            )
+            if self._gzip_upload:
+                import gzip
+
+                # Level 1 is the fastest and still ~2x on base64 text
+                response = self._session.post(
+                    self.api_endpoint,
+                    data=gzip.compress(body, compresslevel=1),
+                    headers={"Content-Encoding": "gzip"},
+                    timeout=timeout
+                )
+                if response.status_code == 415:
+                    logger.info("Doubao endpoint rejected gzip upload, sending uncompressed")
+                    self._gzip_upload = False
+
+            if not self._gzip_upload:
+                response = self._session.post(
+                    self.api_endpoint,
+                    data=body,
+                    timeout=timeout
+                )
 
             # Check timeout
             if time.time() - start_time > timeout:
@@ -202,7 +242,7 @@ class DoubaoAPIAdapter(VisionModelAdapter):
                 )
 
             # Parse response
-            result = response.json()
+            result = _loads_json(response.content)
             output_text = result["choices"][0]["message"]["content"]
 
             # Parse to UIElements
@@ -240,25 +280,35 @@ class DoubaoAPIAdapter(VisionModelAdapter):
         Returns:
             Base64-encoded JPEG image
         """
+        import base64
+        import io
         from PIL import Image
 
         # Downscale for API (max 1280px)
         image = screenshot.image_data
         max_size = 1280
 
-        if max(image.size) > max_size:
-            ratio = max_size / max(image.size)
+        longest = max(image.size)
+
+        if longest > max_size:
+            ratio = max_size / longest
             new_size = (int(image.width * ratio), int(image.height * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # BILINEAR: the difference from LANCZOS is lost in JPEG Q85.
+            # reducing_gap box-reduces by an integer factor first, so
+            # 2K/4K captures resample far fewer source pixels
+            image = image.resize(new_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
             logger.debug(f"Downscaled image to {new_size} for API")
 
+        # JPEG needs RGB; screenshots usually already are
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
         # Convert to JPEG and encode
         buffer = io.BytesIO()
-        image.convert("RGB").save(buffer, format="JPEG", quality=85)
-        image_bytes = buffer.getvalue()
+        image.save(buffer, format="JPEG", quality=85, optimize=False)
 
-        # Encode to base64
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+        # Encode to base64 straight from the buffer (no bytes copy)
+        image_base64 = base64.b64encode(buffer.getbuffer()).decode("ascii")
 
         return image_base64
 
@@ -271,13 +321,11 @@ class DoubaoAPIAdapter(VisionModelAdapter):
         elements = []
 
         try:
-            import re
-            import json
-
-            # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                parsed_data = json.loads(json_match.group())
+            # Extract JSON array from response (first '[' to last ']')
+            start = response_text.find('[')
+            end = response_text.rfind(']')
+            if start != -1 and end > start:
+                parsed_data = _loads_json(response_text[start:end + 1])
 
                 for item in parsed_data:
                     element = UIElement(
@@ -301,7 +349,11 @@ class DoubaoAPIAdapter(VisionModelAdapter):
         return elements
 
     def unload(self) -> None:
-        """Cleanup API client (nothing to unload)."""
+        """Cleanup API client (closes pooled connections)."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
         self.is_loaded = False
         logger.info(
             f"Doubao API client closed (total requests: {self._request_count})"
@@ -13,6 +13,12 @@ from .minicpm_adapter import MiniCPMAdapter
 from .doubao_adapter import DoubaoAPIAdapter
 from ..infrastructure.logger import logger
 
+# Local model directories under model_dir, keyed by their "models.<key>" config
+_LOCAL_MODEL_DIRS = {
+    "uitars": "ui-tars-7b",
+    "minicpm": "minicpm-v-2.6",
+}
+
 
 class ModelDetector:
     """Detect hardware and select optimal vision model.
@@ -86,19 +92,18 @@ class ModelDetector:
         """
         adapters = []
 
-        # UI-TARS (GPU)
-        if self._check_gpu_requirements():
-            uitars_path = self.model_dir / "ui-tars-7b"
-            if uitars_path.exists():
-                adapters.append(UITarsAdapter(uitars_path, self.config))
-                logger.info("Found UI-TARS 7B (GPU)")
+        # UI-TARS (GPU); the path is checked first so the GPU check's
+        # torch import is skipped when the model isn't installed
+        uitars_path = self.model_dir / _LOCAL_MODEL_DIRS["uitars"]
+        if uitars_path.exists() and self._check_gpu_requirements():
+            adapters.append(UITarsAdapter(uitars_path, self.config))
+            logger.info("Found UI-TARS 7B (GPU)")
 
         # MiniCPM (CPU)
-        if self._check_cpu_requirements():
-            minicpm_path = self.model_dir / "minicpm-v-2.6"
-            if minicpm_path.exists():
-                adapters.append(MiniCPMAdapter(minicpm_path, self.config))
-                logger.info("Found MiniCPM-V 2.6 (CPU)")
+        minicpm_path = self.model_dir / _LOCAL_MODEL_DIRS["minicpm"]
+        if minicpm_path.exists() and self._check_cpu_requirements():
+            adapters.append(MiniCPMAdapter(minicpm_path, self.config))
+            logger.info("Found MiniCPM-V 2.6 (CPU)")
 
         # Doubao Cloud API
         if self.config.get("enable_cloud_api", False):
@@ -110,6 +115,22 @@ class ModelDetector:
         logger.info(f"Total adapters detected: {len(adapters)}")
         return adapters
 
+    def has_local_models(self) -> bool:
+        """Check whether an enabled local model is installed.
+
+        Only looks at config and the model directories, without importing
+        torch.
+
+        Returns:
+            True if a local adapter may be used
+        """
+        models = self.config.get("models", {})
+        return any(
+            models.get(key, {}).get("enabled", True)
+            and (self.model_dir / dir_name).exists()
+            for key, dir_name in _LOCAL_MODEL_DIRS.items()
+        )
+
     def _check_gpu_requirements(self) -> bool:
         """Check if GPU meets UI-TARS requirements.
 
@@ -6,6 +6,8 @@ from typing import Optional
 import hashlib
 from PIL import Image
 
+from ..utils.image_hash import dhash
+
 
 @dataclass
 class Screenshot:
@@ -19,7 +21,8 @@ class Screenshot:
         window_title: Title of the window that was captured
         app_name: Name of the application
         captured_at: Timestamp when screenshot was taken
-        file_size: Approximate size in KB (for statistics)
+        file_size: Uncompressed pixel data size in KB (for statistics)
+        perceptual_hash: 64-bit dHash for near-duplicate detection
     """
 
     hash: str
@@ -30,6 +33,7 @@ class Screenshot:
     app_name: Optional[str] = None
     captured_at: datetime = field(default_factory=datetime.now)
     file_size: Optional[int] = None
+    perceptual_hash: Optional[int] = None
 
     def __post_init__(self):
         """Validate screenshot data."""
@@ -58,17 +62,13 @@ class Screenshot:
         Returns:
             Screenshot instance with computed hash
         """
-        # Compute hash of image data
-        img_hash = cls.compute_hash(image)
+        # Raw pixel buffer is shared by the hash and the size estimate
+        pixels = image.tobytes()
+        img_hash = cls.compute_hash(image, pixels)
 
         # Get dimensions
         width, height = image.size
-
-        # Estimate file size (approximate)
-        import io
-        buffer = io.BytesIO()
-        image.save(buffer, format="PNG")
-        file_size_kb = len(buffer.getvalue()) // 1024
+        file_size_kb = len(pixels) // 1024
 
         return cls(
             hash=img_hash,
@@ -78,23 +78,30 @@ class Screenshot:
             window_title=window_title,
             app_name=app_name,
             file_size=file_size_kb,
+            perceptual_hash=dhash(image),
         )
 
     @staticmethod
-    def compute_hash(image: Image.Image) -> str:
+    def compute_hash(image: Image.Image, pixels: Optional[bytes] = None) -> str:
         """Compute SHA-256 hash of image data.
 
+        Hashes the raw pixel buffer together with mode and size, so no
+        PNG encode is needed.
+
         Args:
             image: PIL Image object
+            pixels: Raw pixel data from image.tobytes(), if already available
 
         Returns:
             64-character hex string (SHA-256 hash)
         """
-        import io
-        buffer = io.BytesIO()
-        image.save(buffer, format="PNG")
-        image_bytes = buffer.getvalue()
-        return hashlib.sha256(image_bytes).hexdigest()
+        if pixels is None:
+            pixels = image.tobytes()
+        digest = hashlib.sha256(
+            f"{image.mode}:{image.width}x{image.height}:".encode("ascii")
+        )
+        digest.update(memoryview(pixels))
+        return digest.hexdigest()
 
     def to_dict(self) -> dict:
         """Convert to dictionary (without image data for privacy).
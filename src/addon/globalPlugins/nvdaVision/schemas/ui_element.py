@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import List, Optional
 from PIL import Image
 
+from ..constants import LOW_CONFIDENCE_THRESHOLD
+
 
 @dataclass
 class UIElement:
@@ -70,7 +72,6 @@ class UIElement:
     @property
     def is_uncertain(self) -> bool:
         """Check if confidence is below threshold (real.md constraint 3)."""
-        from ..constants import LOW_CONFIDENCE_THRESHOLD
         return self.confidence < LOW_CONFIDENCE_THRESHOLD
 
     def to_dict(self) -> dict:
@@ -5,7 +5,7 @@ to satisfy real.md constraint 2.
 """
 
 import base64
-from typing import Optional
+from typing import List, Optional
 
 
 class DPAPIEncryption:
@@ -121,6 +121,50 @@ class DPAPIEncryption:
                 "Decryption failed. Key may have been encrypted by different user."
             ) from e
 
+    @staticmethod
+    def decrypt_many(encrypted_values: List[str]) -> List[str]:
+        """Decrypt several DPAPI-encrypted strings in one call.
+
+        DPAPI has no batch API; this imports win32crypt and the logger
+        once and decrypts each value in turn.
+
+        Args:
+            encrypted_values: Base64-encoded encrypted strings
+
+        Returns:
+            Decrypted plaintext strings, in the same order
+
+        Raises:
+            RuntimeError: If any value fails to decrypt
+        """
+        from ..infrastructure.logger import logger
+
+        try:
+            import win32crypt
+        except ImportError:
+            # Fallback for non-Windows platforms (development only)
+            logger.warning("win32crypt not available, using base64 decoding (INSECURE)")
+            return [
+                base64.b64decode(value).decode('utf-8')
+                for value in encrypted_values
+            ]
+
+        try:
+            plaintexts = [
+                win32crypt.CryptUnprotectData(
+                    base64.b64decode(value), None, None, None, 0
+                )[1].decode('utf-8')
+                for value in encrypted_values
+            ]
+        except Exception as e:
+            logger.exception("Failed to decrypt API keys")
+            raise RuntimeError(
+                "Decryption failed. Key may have been encrypted by different user."
+            ) from e
+
+        logger.debug(f"Decrypted {len(plaintexts)} API keys")
+        return plaintexts
+
 
 def mask_api_key(api_key: Optional[str]) -> str:
     """Mask API key for safe logging.
@@ -11,6 +11,7 @@ from ..schemas.screenshot import Screenshot
 from ..schemas.recognition_result import RecognitionResult
 from ..infrastructure.cache_database import CacheDatabase
 from ..infrastructure.logger import logger
+from ..constants import SIMILAR_SCREENSHOT_MAX_DISTANCE
 
 
 class CacheManager:
@@ -20,7 +21,8 @@ class CacheManager:
         self,
         cache_dir: Path,
         ttl_seconds: int = 300,
-        max_size: int = 1000
+        max_size: int = 1000,
+        fuzzy_hamming_threshold: int = SIMILAR_SCREENSHOT_MAX_DISTANCE
     ):
         """Initialize cache manager.
 
@@ -28,10 +30,14 @@ class CacheManager:
             cache_dir: Directory for cache database
             ttl_seconds: Time-to-live for cache entries (default: 5 minutes)
             max_size: Maximum number of cached results
+            fuzzy_hamming_threshold: Perceptual-hash distance below which an
+                exact-hash miss reuses a similar screenshot's result
+                (0 disables)
         """
         self.cache_dir = cache_dir
         self.ttl_seconds = ttl_seconds
         self.max_size = max_size
+        self.fuzzy_hamming_threshold = fuzzy_hamming_threshold
 
         # Initialize database
         db_path = cache_dir / "recognition_cache.db"
@@ -54,6 +60,19 @@ class CacheManager:
             # Lookup in database
             cached_data = self.db.lookup_cache(screenshot.hash)
 
+            # Fall back to a visually near-identical screenshot
+            if (
+                cached_data is None
+                and screenshot.perceptual_hash is not None
+                and self.fuzzy_hamming_threshold > 0
+            ):
+                cached_data = self.db.lookup_similar(
+                    screenshot.perceptual_hash,
+                    screenshot.width,
+                    screenshot.height,
+                    self.fuzzy_hamming_threshold
+                )
+
             if cached_data is None:
                 return None
 
@@ -99,7 +118,8 @@ class CacheManager:
                 recognition_result=result_dict,
                 model_name=result.model_name,
                 ttl_minutes=self.ttl_seconds // 60,
-                max_results=self.max_size
+                max_results=self.max_size,
+                phash=screenshot.perceptual_hash
             )
 
             logger.info(
@@ -56,11 +56,8 @@ class ResultProcessor:
         """
         logger.debug(f"Processing {len(elements)} raw elements")
 
-        # Filter invalid elements
-        valid_elements = self._filter_invalid(elements)
-
-        # Add uncertainty annotations
-        annotated_elements = self._annotate_uncertainty(valid_elements)
+        # Filter invalid elements and annotate uncertainty in one pass
+        annotated_elements = self._filter_and_annotate(elements)
 
         # Sort elements by position (top-to-bottom, left-to-right)
         sorted_elements = self._sort_by_position(annotated_elements)
@@ -90,34 +87,49 @@ class ResultProcessor:
 
         return result
 
-    def _filter_invalid(self, elements: List[UIElement]) -> List[UIElement]:
-        """Filter out invalid elements.
+    def _filter_and_annotate(self, elements: List[UIElement]) -> List[UIElement]:
+        """Drop invalid elements and mark low-confidence ones as uncertain.
+
+        Single pass over up to MAX_UI_ELEMENTS elements; the threshold is
+        bound to a local and debug messages are formatted only when
+        DEBUG logging is enabled.
 
         Args:
             elements: Raw elements
 
         Returns:
-            Valid elements only
+            Valid elements, low-confidence ones annotated "uncertain"
         """
+        threshold = self.confidence_threshold
         valid = []
         removed = 0
 
         for element in elements:
             # Check for valid bbox
-            if not element.bbox or len(element.bbox) != 4:
+            bbox = element.bbox
+            if not bbox or len(bbox) != 4:
                 removed += 1
                 continue
 
-            x1, y1, x2, y2 = element.bbox
+            x1, y1, x2, y2 = bbox
             if x1 >= x2 or y1 >= y2:
                 removed += 1
                 continue
 
             # Check confidence
-            if element.confidence < 0.0 or element.confidence > 1.0:
+            confidence = element.confidence
+            if not 0.0 <= confidence <= 1.0:
                 removed += 1
                 continue
 
+            if confidence < threshold:
+                # Mark as uncertain
+                element.attributes.setdefault("annotations", []).append("uncertain")
+                logger.debug(
+                    "Marked element as uncertain: {} {!r} (confidence={:.2f})",
+                    element.element_type, element.text, confidence
+                )
+
             valid.append(element)
 
         if removed > 0:
@@ -125,29 +137,6 @@ class ResultProcessor:
 
         return valid
 
-    def _annotate_uncertainty(self, elements: List[UIElement]) -> List[UIElement]:
-        """Add uncertainty annotations to low-confidence elements.
-
-        Args:
-            elements: Elements to annotate
-
-        Returns:
-            Elements with uncertainty annotations
-        """
-        for element in elements:
-            if element.confidence < self.confidence_threshold:
-                # Mark as uncertain
-                if "annotations" not in element.attributes:
-                    element.attributes["annotations"] = []
-
-                element.attributes["annotations"].append("uncertain")
-                logger.debug(
-                    f"Marked element as uncertain: {element.element_type} "
-                    f"'{element.text}' (confidence={element.confidence:.2f})"
-                )
-
-        return elements
-
     def _sort_by_position(self, elements: List[UIElement]) -> List[UIElement]:
         """Sort elements by visual position (reading order).
 
@@ -5,6 +5,7 @@ from GPU → CPU → Cloud API, following privacy-first principles.
 """
 
 from typing import List, Optional
+import threading
 import time
 
 from ..schemas.screenshot import Screenshot
@@ -50,6 +51,9 @@ class VisionEngine:
         self._fallback_count = 0
         self._cloud_count = 0
 
+        # Adapters are not guaranteed thread-safe; run one inference at a time
+        self._infer_lock = threading.Lock()
+
         logger.info(
             f"VisionEngine initialized: "
             f"primary={primary_adapter.name}, "
@@ -100,6 +104,15 @@ class VisionEngine:
             Tuple of (list of UIElements, inference source)
             Returns empty list if all models fail
         """
+        with self._infer_lock:
+            return self._infer_with_fallback(screenshot, timeout)
+
+    def _infer_with_fallback(
+        self,
+        screenshot: Screenshot,
+        timeout: float
+    ) -> tuple[List[UIElement], InferenceSource]:
+        """Run the fallback chain (caller holds the inference lock)."""
         self._inference_count += 1
         start_time = time.time()
 
@@ -94,7 +94,7 @@ class NVDAVisionSettingsPanel(SettingsPanel):
             min=3,
             max=15
         )
-        self.spinProgress.SetToolTip("超过此时间后提示"正在识别..."")
+        self.spinProgress.SetToolTip("超过此时间后提示“正在识别...”")
 
         # 分隔符
         sHelper.addItem(wx.StaticLine(self), flag=wx.EXPAND)
@@ -1,8 +1,11 @@
 """Utility functions for NVDA Vision plugin."""
 
 from .threading_utils import TimeoutThread, run_with_timeout
+from .image_hash import dhash, hamming_distance
 
 __all__ = [
     "TimeoutThread",
     "run_with_timeout",
+    "dhash",
+    "hamming_distance",
 ]
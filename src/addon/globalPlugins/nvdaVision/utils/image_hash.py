@@ -0,0 +1,53 @@
+"""Perceptual image hashing for near-duplicate screenshot detection."""
+
+from PIL import Image
+
+# dHash grid: 9x8 grayscale pixels give 8x8 = 64 horizontal differences
+DHASH_SIZE = 8
+
+
+def dhash(image: Image.Image) -> int:
+    """Compute a 64-bit difference hash (dHash) of an image.
+
+    Visually similar screenshots (cursor blink, clock tick) produce hashes
+    that differ in only a few bits, unlike the SHA-256 content hash.
+
+    Args:
+        image: PIL Image to hash
+
+    Returns:
+        64-bit integer hash
+    """
+    small = image.convert("L").resize(
+        (DHASH_SIZE + 1, DHASH_SIZE), Image.LANCZOS
+    )
+    # "L" mode: one byte per pixel, row-major
+    pixels = small.tobytes()
+    row_len = DHASH_SIZE + 1
+
+    value = 0
+    for row in range(DHASH_SIZE):
+        offset = row * row_len
+        for col in range(DHASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count differing bits between two hashes.
+
+    Args:
+        a: First hash
+        b: Second hash
+
+    Returns:
+        Number of differing bits
+    """
+    return (a ^ b).bit_count()
+
+
+__all__ = [
+    "dhash",
+    "hamming_distance",
+]
@@ -0,0 +1 @@
+"""Unit tests for plugin modules that run without NVDA"""
@@ -0,0 +1,22 @@
+"""
+Make the plugin's subpackages importable without NVDA.
+
+The nvdaVision package __init__ imports NVDA's runtime modules, so the
+package is registered here as an empty namespace pointing at the source
+directory. Subpackages (infrastructure, utils, schemas, ...) then import
+normally, including their relative imports.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+_PLUGIN_DIR = (
+    Path(__file__).parent.parent.parent
+    / "src" / "addon" / "globalPlugins" / "nvdaVision"
+)
+
+if "nvdaVision" not in sys.modules:
+    _package = types.ModuleType("nvdaVision")
+    _package.__path__ = [str(_PLUGIN_DIR)]
+    sys.modules["nvdaVision"] = _package
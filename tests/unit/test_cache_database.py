@@ -0,0 +1,296 @@
+"""
+CacheDatabase Tests
+
+Covers schema migration of older databases, batched hit statistics,
+TTL cleanup, LRU eviction and perceptual-hash lookups.
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from nvdaVision.infrastructure.cache_database import CacheDatabase
+
+
+RESULT = {
+    "elements": [
+        {"type": "button", "text": "OK", "bbox": [1, 2, 30, 40],
+         "confidence": 0.9, "actionable": True},
+        {"type": "text", "bbox": [5, 6, 70, 80], "confidence": 0.5},
+    ],
+    "inference_time": 0.2,
+    "status": "success",
+}
+
+
+def _hash(n: int) -> str:
+    return f"{n:064x}"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "recognition_cache.db"
+
+
+@pytest.fixture
+def db(db_path):
+    database = CacheDatabase(db_path)
+    yield database
+    database.close()
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_legacy_ui_elements_table_is_rebuilt(db_path):
+    """ui_elements without the packed bbox column is dropped and recreated"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE ui_elements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            result_id INTEGER NOT NULL,
+            element_type TEXT NOT NULL,
+            bbox_x1 INTEGER, bbox_y1 INTEGER, bbox_x2 INTEGER, bbox_y2 INTEGER,
+            confidence REAL NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT INTO ui_elements (result_id, element_type, confidence) "
+        "VALUES (1, 'button', 0.9)"
+    )
+    conn.commit()
+    conn.close()
+
+    db = CacheDatabase(db_path)
+    try:
+        columns = _columns(db.conn, "ui_elements")
+        assert "bbox" in columns
+        assert "bbox_x1" not in columns
+        assert db.conn.execute("SELECT COUNT(*) FROM ui_elements").fetchone()[0] == 0
+
+        db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+        blob = db.conn.execute("SELECT bbox FROM ui_elements LIMIT 1").fetchone()[0]
+        assert len(blob) == 8
+    finally:
+        db.close()
+
+
+def test_pre_epoch_database_is_migrated(db_path):
+    """Old tables gain new columns; text timestamps are dropped once"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE screenshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sha256_hash TEXT UNIQUE NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            source_window TEXT,
+            source_app TEXT,
+            captured_at TIMESTAMP NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            file_size_kb INTEGER,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE recognition_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            screenshot_id INTEGER NOT NULL,
+            model_name TEXT NOT NULL,
+            model_version TEXT,
+            inference_time_ms INTEGER NOT NULL,
+            confidence_score REAL,
+            element_count INTEGER DEFAULT 0,
+            result_json TEXT NOT NULL,
+            hit_count INTEGER DEFAULT 0,
+            last_accessed_at TIMESTAMP,
+            status TEXT NOT NULL DEFAULT 'success',
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "INSERT INTO screenshots (sha256_hash, width, height, captured_at, expires_at) "
+        "VALUES (?, 100, 100, '2025-01-01 00:00:00', '2999-01-01 00:00:00')",
+        (_hash(1),)
+    )
+    conn.execute(
+        "INSERT INTO recognition_results "
+        "(screenshot_id, model_name, inference_time_ms, result_json, last_accessed_at) "
+        "VALUES (1, 'm', 10, '{}', '2025-01-01 00:00:00')"
+    )
+    conn.commit()
+    conn.close()
+
+    db = CacheDatabase(db_path)
+    try:
+        assert "phash" in _columns(db.conn, "screenshots")
+        assert "expires_at" in _columns(db.conn, "recognition_results")
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        assert db.conn.execute("SELECT COUNT(*) FROM screenshots").fetchone()[0] == 0
+        assert db.conn.execute("SELECT COUNT(*) FROM recognition_results").fetchone()[0] == 0
+
+        db.insert_cache(_hash(2), 100, 100, RESULT, "m")
+    finally:
+        db.close()
+
+    # Migrated databases keep their entries on the next open
+    db = CacheDatabase(db_path)
+    try:
+        assert db.lookup_cache(_hash(2)) is not None
+    finally:
+        db.close()
+
+
+def test_lookup_roundtrip(db):
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+
+    result = db.lookup_cache(_hash(1))
+    assert result["elements"] == RESULT["elements"]
+    assert result["_cache_hit"] is True
+    assert db.lookup_cache(_hash(2)) is None
+
+
+def test_hits_are_written_in_batches(db):
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+
+    for _ in range(3):
+        db.lookup_cache(_hash(1))
+    db._flush_hits()
+
+    assert not db._hit_queue
+    assert db.conn.execute(
+        "SELECT hit_count FROM recognition_results"
+    ).fetchone()[0] == 3
+    assert db.get_stats()["total_cache_hits"] == 3
+
+    # Metadata lookups don't count as hits
+    db.lookup_cache_meta(_hash(1))
+    db._flush_hits()
+    assert db.lookup_cache_meta(_hash(1))["hit_count"] == 3
+
+
+def test_pending_hits_are_flushed_on_close(db_path):
+    db = CacheDatabase(db_path)
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+    db.lookup_cache(_hash(1))
+    db.lookup_cache(_hash(1))
+    db.close()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT hit_count FROM recognition_results").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_expired_entries_are_cleaned_up(db):
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+    db.insert_cache(_hash(2), 100, 100, RESULT, "m")
+
+    past = int(time.time()) - 10
+    with db.conn:
+        db.conn.execute(
+            "UPDATE screenshots SET expires_at = ? WHERE sha256_hash = ?",
+            (past, _hash(1))
+        )
+        db.conn.execute(
+            "UPDATE recognition_results SET expires_at = ? WHERE screenshot_id = "
+            "(SELECT id FROM screenshots WHERE sha256_hash = ?)",
+            (past, _hash(1))
+        )
+
+    assert db.lookup_cache(_hash(1)) is None
+    assert db._cleanup_expired() == 1
+
+    # Results and elements go with their screenshot
+    stats = db.get_stats()
+    assert stats["total_screenshots"] == 1
+    assert stats["total_results"] == 1
+    assert stats["total_elements"] == len(RESULT["elements"])
+    assert db._cached_row_count == 1
+    assert db.lookup_cache(_hash(2)) is not None
+
+
+def test_least_recently_used_results_are_evicted(db):
+    for n in range(3):
+        db.insert_cache(_hash(n), 100, 100, RESULT, "m", max_results=3)
+
+    # Entry 0 was read most recently, entry 1 least recently
+    with db.conn:
+        for n, accessed_at in ((0, 300), (1, 100), (2, 200)):
+            db.conn.execute(
+                "UPDATE recognition_results SET last_accessed_at = ? WHERE screenshot_id = "
+                "(SELECT id FROM screenshots WHERE sha256_hash = ?)",
+                (accessed_at, _hash(n))
+            )
+
+    db.insert_cache(_hash(3), 100, 100, RESULT, "m", max_results=3)
+
+    assert db.get_stats()["total_results"] == 3
+    assert db._cached_row_count == 3
+    assert db.lookup_cache(_hash(1)) is None
+    for n in (0, 2, 3):
+        assert db.lookup_cache(_hash(n)) is not None
+
+
+def test_lookup_similar_matches_same_size_within_distance(db):
+    phash = (1 << 63) | 0b1011  # High bit exercises the signed storage
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m", phash=phash)
+
+    assert db.lookup_similar(phash ^ 0b11, 100, 100, 5) is not None
+    assert db.lookup_similar(phash ^ 0b11111, 100, 100, 5) is None
+    assert db.lookup_similar(phash, 100, 200, 5) is None
+
+
+def test_lookup_similar_picks_closest(db):
+    base = 0xF0F0F0F0F0F0F0F0
+    far = dict(RESULT, source_window="far")
+    near = dict(RESULT, source_window="near")
+    db.insert_cache(_hash(1), 100, 100, far, "m", phash=base ^ 0b111)
+    db.insert_cache(_hash(2), 100, 100, near, "m", phash=base ^ 0b1)
+
+    result = db.lookup_similar(base, 100, 100, 5)
+    assert result["source_window"] == "near"
+
+
+def test_lookup_similar_skips_expired(db):
+    phash = 0x0123456789ABCDEF
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m", phash=phash)
+    with db.conn:
+        db.conn.execute("UPDATE screenshots SET expires_at = ?", (int(time.time()) - 10,))
+
+    assert db.lookup_similar(phash, 100, 100, 5) is None
+
+
+def test_clear(db):
+    db.insert_cache(_hash(1), 100, 100, RESULT, "m")
+    db.lookup_cache(_hash(1))
+    db.clear()
+
+    stats = db.get_stats()
+    assert stats["total_screenshots"] == 0
+    assert stats["total_results"] == 0
+    assert stats["total_elements"] == 0
+    assert db._cached_row_count == 0
+
+
+def test_close_waits_for_startup_cleanup(db_path, monkeypatch):
+    """Closing right after opening doesn't pull the connection from under cleanup"""
+    errors = []
+    monkeypatch.setattr("threading.excepthook", errors.append)
+
+    cleanup = CacheDatabase._cleanup_expired
+
+    def slow_cleanup(self):
+        time.sleep(0.2)
+        return cleanup(self)
+
+    monkeypatch.setattr(CacheDatabase, "_cleanup_expired", slow_cleanup)
+
+    database = CacheDatabase(db_path)
+    database.close()
+
+    assert not database._cleanup_thread.is_alive()
+    assert errors == []
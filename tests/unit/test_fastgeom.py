@@ -0,0 +1,40 @@
+"""
+Element Geometry Tests
+
+Covers the batched center/validity computation used for navigation and
+activation.
+"""
+
+from nvdaVision._fastgeom import validate_and_center
+
+
+def test_centers_are_floored_midpoints():
+    centers, valid = validate_and_center([[0, 0, 10, 20], [1, 1, 4, 4]], 100, 100)
+    assert centers == [(5, 10), (2, 2)]
+    assert valid == [True, True]
+
+
+def test_bbox_on_screen_edge_is_valid():
+    _, valid = validate_and_center([[0, 0, 1920, 1080]], 1920, 1080)
+    assert valid == [True]
+
+
+def test_invalid_bboxes():
+    bboxes = [
+        [10, 10, 5, 20],       # x2 < x1
+        [10, 10, 10, 20],      # zero width
+        [-1, 0, 10, 10],       # off the left edge
+        [0, 0, 10, 1081],      # below the screen
+        [1, 2, 3],             # too few coordinates
+        [],
+        None,
+    ]
+    centers, valid = validate_and_center(bboxes, 1920, 1080)
+
+    assert valid == [False] * len(bboxes)
+    assert len(centers) == len(bboxes)
+    assert centers[4:] == [(0, 0)] * 3
+
+
+def test_empty_input():
+    assert validate_and_center([], 100, 100) == ([], [])
@@ -0,0 +1,76 @@
+"""
+Image Hash Tests
+
+Covers the dHash used for near-duplicate detection and the raw-pixel
+SHA-256 content hash of Screenshot.
+"""
+
+from PIL import Image, ImageDraw
+
+from nvdaVision.schemas.screenshot import Screenshot
+from nvdaVision.utils.image_hash import dhash, hamming_distance
+
+
+def _screen(split: int, size=(200, 100)) -> Image.Image:
+    """White image with a black band left of x=split."""
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).rectangle((0, 0, split, size[1]), fill="black")
+    return image
+
+
+def test_hamming_distance():
+    assert hamming_distance(0, 0) == 0
+    assert hamming_distance(0b1011, 0b0001) == 2
+    assert hamming_distance((1 << 64) - 1, 0) == 64
+
+
+def test_dhash_is_64_bit_and_deterministic():
+    image = _screen(60)
+    value = dhash(image)
+    assert 0 <= value < 1 << 64
+    assert dhash(image.copy()) == value
+
+
+def test_dhash_tolerates_small_changes():
+    base = _screen(60)
+    blinked = base.copy()
+    ImageDraw.Draw(blinked).rectangle((150, 40, 151, 50), fill="black")  # caret
+
+    assert hamming_distance(dhash(base), dhash(blinked)) <= 2
+
+
+def test_dhash_separates_different_screens():
+    assert hamming_distance(dhash(_screen(60)), dhash(_screen(140))) > 5
+
+
+def test_dhash_ignores_mode():
+    image = _screen(60)
+    assert dhash(image) == dhash(image.convert("L"))
+
+
+def test_compute_hash_covers_pixels_mode_and_size():
+    image = _screen(60)
+    value = Screenshot.compute_hash(image)
+
+    assert len(value) == 64
+    assert Screenshot.compute_hash(image.copy()) == value
+    assert Screenshot.compute_hash(image, image.tobytes()) == value
+
+    changed = image.copy()
+    changed.putpixel((199, 99), (254, 255, 255))
+    assert Screenshot.compute_hash(changed) != value
+
+    # Same bytes, different shape or mode
+    assert Screenshot.compute_hash(image.convert("RGBA")) != value
+    flat = Image.frombytes("RGB", (100, 200), image.tobytes())
+    assert Screenshot.compute_hash(flat) != value
+
+
+def test_from_image():
+    image = _screen(60)
+    screenshot = Screenshot.from_image(image, window_title="Notepad")
+
+    assert (screenshot.width, screenshot.height) == (200, 100)
+    assert screenshot.hash == Screenshot.compute_hash(image)
+    assert screenshot.perceptual_hash == dhash(image)
+    assert screenshot.file_size == 200 * 100 * 3 // 1024
@@ -0,0 +1,118 @@
+"""
+Recognition Prefetcher Tests
+
+Drives RecognitionPrefetcher._poll() directly with a fake screen and
+controller; the background thread is not started.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image, ImageDraw
+
+from nvdaVision.core.prefetcher import RecognitionPrefetcher
+from nvdaVision.schemas.screenshot import Screenshot
+
+
+def _screen(split: int, size=(200, 100)) -> Image.Image:
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).rectangle((0, 0, split, size[1]), fill="black")
+    return image
+
+
+class FakeScreen:
+    """Screenshot service returning whatever image is current."""
+
+    def __init__(self):
+        self.image = _screen(60)
+        self.fail = False
+
+    def capture_active_window(self):
+        if self.fail:
+            raise RuntimeError("capture failed")
+        return Screenshot.from_image(self.image)
+
+
+class FakeController:
+    """Controller recording how many recognitions were run."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def recognize_screenshot(self, screenshot):
+        self.calls += 1
+        return SimpleNamespace(element_count=0, call=self.calls)
+
+
+@pytest.fixture
+def screen():
+    return FakeScreen()
+
+
+@pytest.fixture
+def controller():
+    return FakeController()
+
+
+@pytest.fixture
+def prefetcher(controller, screen):
+    return RecognitionPrefetcher(controller, screen, capacity=4)
+
+
+def test_take_returns_result_for_current_screen(prefetcher, controller):
+    prefetcher._poll()
+
+    result = prefetcher.take()
+    assert result is not None and result.call == 1
+    assert prefetcher.take() is None
+
+
+def test_take_without_results_skips_capture(prefetcher, screen):
+    screen.fail = True
+    assert prefetcher.take() is None
+
+
+def test_take_rejects_result_after_screen_change(prefetcher, screen):
+    prefetcher._poll()
+    screen.image = _screen(140)
+
+    assert prefetcher.take() is None
+
+
+def test_take_rejects_result_after_resize(prefetcher, screen):
+    prefetcher._poll()
+    screen.image = _screen(60).resize((400, 200))
+
+    assert prefetcher.take() is None
+
+
+def test_take_returns_none_when_capture_fails(prefetcher, screen):
+    prefetcher._poll()
+    screen.fail = True
+
+    assert prefetcher.take() is None
+
+
+def test_same_screen_is_recognized_once(prefetcher, controller):
+    prefetcher._poll()
+    prefetcher._poll()
+    prefetcher._poll()
+
+    assert controller.calls == 1
+
+
+def test_screen_change_discards_queued_results(prefetcher, screen, controller):
+    prefetcher._poll()
+    screen.image = _screen(140)
+    prefetcher._poll()
+
+    assert controller.calls == 2
+    assert prefetcher.take().call == 2
+    assert prefetcher.take() is None
+
+
+def test_stopped_prefetcher_drops_late_result(prefetcher):
+    prefetcher._stop_event.set()
+    prefetcher._poll()
+
+    assert prefetcher.take() is None